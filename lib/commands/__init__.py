@@ -3,12 +3,35 @@ Phorager Commands Module
 
 Contains all command implementations for the phorager wrapper.
 Each command is implemented as a separate class with consistent interface.
+
+Command classes are imported lazily on first attribute access, so loading
+one command does not import the modules of all the others.
 """
 
-from .config import ConfigCommand
-from .install import InstallCommand
-from .bacterial import BacterialCommand
-from .prophage import ProphageCommand
-from .annotation import AnnotationCommand
+import importlib
+
+# Map exported class names to the submodule that defines them
+_COMMAND_MODULES = {
+    'ConfigCommand': '.config',
+    'InstallCommand': '.install',
+    'BacterialCommand': '.bacterial',
+    'ProphageCommand': '.prophage',
+    'AnnotationCommand': '.annotation'
+}
+
+__all__ = ['ConfigCommand', 'InstallCommand', 'BacterialCommand', 'ProphageCommand','AnnotationCommand']
+
+
+def __getattr__(name):
+    """Import command classes on first access (PEP 562)"""
+    module_name = _COMMAND_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    command_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = command_class
+    return command_class
+
 
-__all__ = ['ConfigCommand', 'InstallCommand', 'BacterialCommand', 'ProphageCommand','AnnotationCommand']
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,68 @@
+"""
+Phorager Config File I/O
+
+Shared reader for the user configuration file (~/.phorager/config.json).
+Parsed contents are cached per process, keyed on the file's path and
+modification time, so commands reading the config repeatedly only parse it
+once while still seeing any later edits.
+"""
+
+import functools
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Union
+
+# Location of the user configuration, resolved once at import
+CONFIG_DIR = Path.home() / '.phorager'
+CONFIG_FILE = CONFIG_DIR / 'config.json'
+
+
+# The mtime_ns argument is part of the cache key only: an edited file has a
+# new mtime and is therefore parsed again.
+@functools.lru_cache(maxsize=8)
+def _read_config_file(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse the config file (cached per path and mtime)"""
+    with open(path_str, 'rb') as f:
+        data = f.read()
+    
+    # orjson is optional; its decode errors subclass ValueError like json's
+    try:
+        from orjson import loads
+    except ImportError:
+        from json import loads
+    config = loads(data)
+    if not isinstance(config, dict):
+        return config
+    
+    # Intern the keys and the backend name: the commands compare these
+    # against literals, and interned strings compare by identity first
+    interned = {}
+    for key, value in config.items():
+        if key == 'backend' and isinstance(value, str):
+            value = sys.intern(value)
+        interned[sys.intern(key)] = value
+    return interned
+
+
+def load_phorager_config(path: Union[str, os.PathLike], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Load the config file merged over a set of defaults
+    
+    Args:
+        path: Path of the config file
+        defaults: Values used for keys missing from the file
+    
+    Returns:
+        New dictionary of the defaults updated with the file contents
+    
+    Raises:
+        FileNotFoundError: If the config file does not exist
+        ValueError: If the file is not valid JSON
+        OSError: If the file cannot be read
+    """
+    path_str = os.fspath(path)
+    mtime_ns = os.stat(path_str).st_mtime_ns
+    merged = defaults.copy()
+    merged.update(_read_config_file(path_str, mtime_ns))
+    return merged
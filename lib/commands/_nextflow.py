@@ -0,0 +1,103 @@
+"""
+Phorager Nextflow Helpers
+
+Shared Nextflow helpers for the commands: the backend/location arguments
+common to every workflow command line, and a check that the Nextflow
+executable is installed and runs. Starting Nextflow's JVM for
+`nextflow -version` takes seconds, so a successful check is remembered in
+~/.phorager/cache/nextflow.probe and reused while the executable is
+unchanged.
+"""
+
+import functools
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# How long a successful `nextflow -version` check is trusted (seconds)
+NEXTFLOW_PROBE_MAX_AGE = 24 * 60 * 60
+
+_PROBE_FILE = Path.home() / '.phorager' / 'cache' / 'nextflow.probe'
+
+
+def nextflow_common_args(config: Dict) -> List[str]:
+    """
+    Build the backend profile and location arguments from the user config
+    
+    The conda backend selects the conda profile (singularity is the default
+    profile), and the database and cache locations are passed only when
+    configured.
+    
+    Args:
+        config: User configuration with backend, db_location, cache_location
+        
+    Returns:
+        List of Nextflow command-line arguments
+    """
+    get = config.get
+    conda = get('backend') == 'conda'
+    args = ['-profile', 'conda'] if conda else []
+    
+    db_location = get('db_location')
+    if db_location:
+        args += ('--database_location', db_location)
+    
+    cache_location = get('cache_location')
+    if cache_location:
+        args += ('--conda_cache_dir' if conda else '--singularity_cache_dir', cache_location)
+    
+    return args
+
+
+def nextflow_available() -> bool:
+    """
+    Check that Nextflow is available, caching the result between runs
+    
+    The resolved executable path, its mtime and the time of the last
+    `nextflow -version` check are stored in the probe file. While the
+    executable is unchanged and the check is recent, no process is spawned
+    at all. Within one process the answer is also memoized per PATH.
+    
+    Returns:
+        True if Nextflow is available, False otherwise
+    """
+    return _probe_nextflow(os.environ.get('PATH', os.defpath))
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_nextflow(search_path: str) -> bool:
+    """Locate and verify the Nextflow executable on the given PATH"""
+    # Fast path: previously verified executable that has not changed
+    try:
+        nextflow_path, mtime_ns, last_verified = _PROBE_FILE.read_text().splitlines()
+        if (os.stat(nextflow_path).st_mtime_ns == int(mtime_ns) and
+                time.time() - float(last_verified) < NEXTFLOW_PROBE_MAX_AGE):
+            return True
+    except (OSError, ValueError):
+        pass
+    
+    nextflow_path = shutil.which('nextflow', path=search_path)
+    if nextflow_path is None or not os.access(nextflow_path, os.X_OK):
+        return False
+    
+    # Imported here: only needed when the cached probe cannot be used
+    import subprocess
+    try:
+        subprocess.run([nextflow_path, '-version'],
+                     capture_output=True,
+                     check=True)
+    except (subprocess.CalledProcessError, OSError):
+        return False
+    
+    # Record the successful probe (best effort)
+    try:
+        _PROBE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _PROBE_FILE.write_text(
+            f"{nextflow_path}\n{os.stat(nextflow_path).st_mtime_ns}\n{time.time()}\n"
+        )
+    except OSError:
+        pass
+    
+    return True
@@ -0,0 +1,21 @@
+"""
+Phorager Output Helpers
+
+Shared helpers for the informational output of the commands.
+"""
+
+import os
+import sys
+
+
+def output_suppressed() -> bool:
+    """
+    Check whether informational output (e.g. dry-run plans) can be skipped
+    
+    Output is only skipped when PHORAGER_QUIET is set and stdout is not a
+    terminal, so an interactive user always sees it.
+    
+    Returns:
+        True if the output would be discarded anyway
+    """
+    return bool(os.environ.get('PHORAGER_QUIET')) and not sys.stdout.isatty()
@@ -0,0 +1,34 @@
+"""
+Phorager Path Helpers
+
+Shared filesystem helpers for the commands.
+"""
+
+from pathlib import Path
+from typing import Iterable, List
+
+
+def paths_exist(paths: Iterable[Path], dirs_only: bool = False) -> List[bool]:
+    """
+    Check whether each path exists (as a directory, if dirs_only)
+    
+    Several paths are checked concurrently, since stat latency on network
+    filesystems adds up when done one after another.
+    
+    Args:
+        paths: Paths to check
+        dirs_only: Only count directories, like os.path.isdir
+    
+    Returns:
+        List of booleans, in the order of the paths
+    """
+    check = Path.is_dir if dirs_only else Path.exists
+    paths = list(paths)
+    if len(paths) < 2:
+        return [check(path) for path in paths]
+    
+    # Imported here: loading concurrent.futures costs more than most
+    # commands ever spend on these checks
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(4, len(paths))) as executor:
+        return list(executor.map(check, paths))
@@ -6,166 +6,241 @@ structural filtering, and sequence clustering.
 """
 
 import argparse
-import json
 import os
-import subprocess
 import sys
+from itertools import chain
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from utils.annotation_validation import (
-    validate_and_detect_prophage_input,
-    validate_checkv_quality_levels,
-    validate_annotation_parameters,
-    validate_filter_mode,
-    validate_min_prophage_length,
-    validate_structural_thresholds,
-    validate_clustering_parameters,
-    validate_databases
+from ._config_io import CONFIG_FILE, load_phorager_config
+from ._nextflow import nextflow_available
+from ._paths import paths_exist
+
+# Prefix for messages written by AnnotationCommand._err
+_ERR_PREFIX = b'Error: '
+
+# Resolved once at import: the user's home and the phorager install
+# directory (where main.nf lives); PHORAGER_DIR overrides the latter
+_HOME = Path.home()
+_PHORAGER_DIR = Path(
+    os.environ.get('PHORAGER_DIR') or
+    (Path(sys.argv[0]).resolve().parent if sys.argv and sys.argv[0] else Path.cwd())
 )
 
 
+class _LevelListAction(argparse.Action):
+    """Store a list option given as space- and/or comma-separated values"""
+    
+    def __call__(self, parser, namespace, values, option_string=None):
+        levels = [level.strip() for value in values for level in value.split(',')]
+        setattr(namespace, self.dest, [level for level in levels if level])
+
+
 class AnnotationCommand:
     """
     Handles annotation workflow execution for prophage sequences
     """
     
-    def __init__(self):
-        """Initialize annotation command"""
-        self.config = {}
-        self.nextflow_params = {}
+    # Database directories used by the annotation workflow
+    DATABASE_DIRS = ('checkv_database', 'pharokka_database', 'phold_database')
     
-    @staticmethod
-    def add_arguments(parser: argparse.ArgumentParser):
-        """Add arguments to the annotation subparser"""
-        
+    # Fixed "Annotation Pipeline" blocks of the dry-run report
+    PIPELINE_FULL = (
+        "Annotation Pipeline:",
+        "  ✓ CheckV - Quality assessment",
+        "  ✓ Pharokka - Functional annotation",
+        "  ✓ PHOLD - Structure prediction",
+        "  ✓ Structural filtering (combined mode)",
+        "  ✓ ANI clustering",
+        ""
+    )
+    PIPELINE_SKIP = (
+        "Annotation Pipeline:",
+        "  ✓ CheckV - Quality assessment",
+        "  ✗ Pharokka - Skipped (--skip-detailed-annotation)",
+        "  ✗ PHOLD - Skipped (--skip-detailed-annotation)",
+        "  ✗ Structural filtering - Skipped (--skip-detailed-annotation)",
+        "  ✓ ANI clustering (CheckV-filtered sequences)",
+        ""
+    )
+    
+    FILTER_MODE_DESCRIPTIONS = {
+        'pharokka': 'Pharokka criteria only',
+        'phold': 'PHOLD criteria only',
+        'combined': 'pass if Pharokka OR PHOLD criteria met'
+    }
+    
+    # Workflow parameters passed to Nextflow, in order:
+    # (nextflow flag, args attribute, condition or None if always passed)
+    NEXTFLOW_PARAMS = (
+        # Quality filtering parameters
+        ('--min_prophage_length', 'min_prophage_length', None),
+        ('--checkv_quality_levels', 'checkv_quality_levels', None),
+        # Skip detailed annotation flag (only if True)
+        ('--skip_detailed_annotation', 'skip_detailed_annotation',
+         lambda args: args.skip_detailed_annotation),
+        # Structural filtering parameters (only if NOT skipping)
+        ('--annotation_filter_mode', 'annotation_filter_mode',
+         lambda args: not args.skip_detailed_annotation),
+        ('--pharokka_structural_perc', 'pharokka_structural_perc',
+         lambda args: not args.skip_detailed_annotation),
+        ('--pharokka_structural_total', 'pharokka_structural_total',
+         lambda args: not args.skip_detailed_annotation),
+        ('--phold_structural_perc', 'phold_structural_perc',
+         lambda args: not args.skip_detailed_annotation),
+        ('--phold_structural_total', 'phold_structural_total',
+         lambda args: not args.skip_detailed_annotation),
+        # Clustering parameters
+        ('--clustering_min_ani', 'clustering_min_ani', None),
+        ('--clustering_min_coverage', 'clustering_min_coverage', None),
+        # Threads (only if user-specified)
+        ('--threads', 'threads', lambda args: args.threads is not None)
+    )
+    
+    # Command-line arguments, built once at import:
+    # (argument group title or None for the parser itself, ((flag, kwargs), ...))
+    ARGUMENT_SPEC = (
         # Required input
-        parser.add_argument(
-            '--prophage',
-            type=str,
-            required=True,
-            help='Input prophage sequences (FASTA file, prophage workflow results directory, '
-                 'or 2.Prophage_detection/ subdirectory)'
-        )
-        
+        (None, (
+            ('--prophage', dict(
+                type=str,
+                required=True,
+                help='Input prophage sequences (FASTA file, prophage workflow results directory, '
+                     'or 2.Prophage_detection/ subdirectory)'
+            )),
+        )),
         # Quality filtering parameters
-        quality_group = parser.add_argument_group('Quality Filtering')
-        quality_group.add_argument(
-            '--min-prophage-length',
-            type=int,
-            default=5000,
-            help='Minimum prophage length in bp (500-50000, default: 5000)'
-        )
-        quality_group.add_argument(
-            '--checkv-quality-levels',
-            type=str,
-            default='Complete,High-quality,Medium-quality',
-            help='Comma-separated list of CheckV quality levels to retain '
-                 '(default: Complete,High-quality,Medium-quality). '
-                 'Valid: Complete, High-quality, Medium-quality, Low-quality, Not-determined'
-        )
-        
+        ('Quality Filtering', (
+            ('--min-prophage-length', dict(
+                type=int,
+                default=5000,
+                help='Minimum prophage length in bp (500-50000, default: 5000)'
+            )),
+            ('--checkv-quality-levels', dict(
+                nargs='+',
+                action=_LevelListAction,
+                default=['Complete', 'High-quality', 'Medium-quality'],
+                metavar='LEVEL',
+                help='CheckV quality levels to retain, comma- or space-separated '
+                     '(default: Complete,High-quality,Medium-quality). '
+                     'Valid: Complete, High-quality, Medium-quality, Low-quality, Not-determined'
+            )),
+        )),
         # Annotation control
-        annotation_group = parser.add_argument_group('Annotation Control')
-        annotation_group.add_argument(
-            '--skip-detailed-annotation',
-            action='store_true',
-            help='Skip detailed annotation (Pharokka + PHOLD) and proceed directly to clustering. '
-                 'Use for rapid clustering without functional annotation.'
-        )
-        
+        ('Annotation Control', (
+            ('--skip-detailed-annotation', dict(
+                action='store_true',
+                help='Skip detailed annotation (Pharokka + PHOLD) and proceed directly to clustering. '
+                     'Use for rapid clustering without functional annotation.'
+            )),
+        )),
         # Structural filtering parameters
-        filtering_group = parser.add_argument_group('Structural Gene Filtering')
-        filtering_group.add_argument(
-            '--annotation-filter-mode',
-            type=str,
-            choices=['pharokka', 'phold', 'combined'],
-            default='combined',
-            help='Filtering mode based on structural gene content (default: combined). '
-                 'combined = pass if Pharokka OR PHOLD criteria met'
-        )
-        filtering_group.add_argument(
-            '--pharokka-structural-perc',
-            type=float,
-            default=10.0,
-            help='Minimum percentage of structural genes from Pharokka (0-100, default: 10.0)'
-        )
-        filtering_group.add_argument(
-            '--pharokka-structural-total',
-            type=int,
-            default=3,
-            help='Minimum total structural genes from Pharokka (1-20, default: 3)'
-        )
-        filtering_group.add_argument(
-            '--phold-structural-perc',
-            type=float,
-            default=10.0,
-            help='Minimum percentage of structural genes from PHOLD (0-100, default: 10.0)'
-        )
-        filtering_group.add_argument(
-            '--phold-structural-total',
-            type=int,
-            default=3,
-            help='Minimum total structural genes from PHOLD (1-20, default: 3)'
-        )
-        
+        ('Structural Gene Filtering', (
+            ('--annotation-filter-mode', dict(
+                type=str,
+                choices=['pharokka', 'phold', 'combined'],
+                default='combined',
+                help='Filtering mode based on structural gene content (default: combined). '
+                     'combined = pass if Pharokka OR PHOLD criteria met'
+            )),
+            ('--pharokka-structural-perc', dict(
+                type=float,
+                default=10.0,
+                help='Minimum percentage of structural genes from Pharokka (0-100, default: 10.0)'
+            )),
+            ('--pharokka-structural-total', dict(
+                type=int,
+                default=3,
+                help='Minimum total structural genes from Pharokka (1-20, default: 3)'
+            )),
+            ('--phold-structural-perc', dict(
+                type=float,
+                default=10.0,
+                help='Minimum percentage of structural genes from PHOLD (0-100, default: 10.0)'
+            )),
+            ('--phold-structural-total', dict(
+                type=int,
+                default=3,
+                help='Minimum total structural genes from PHOLD (1-20, default: 3)'
+            )),
+        )),
         # Clustering parameters
-        clustering_group = parser.add_argument_group('Clustering Parameters')
-        clustering_group.add_argument(
-            '--clustering-min-ani',
-            type=float,
-            default=95.0,
-            help='Minimum ANI for clustering (0-100, default: 95.0)'
-        )
-        clustering_group.add_argument(
-            '--clustering-min-coverage',
-            type=float,
-            default=85.0,
-            help='Minimum coverage for clustering (0-100, default: 85.0)'
-        )
-        
+        ('Clustering Parameters', (
+            ('--clustering-min-ani', dict(
+                type=float,
+                default=95.0,
+                help='Minimum ANI for clustering (0-100, default: 95.0)'
+            )),
+            ('--clustering-min-coverage', dict(
+                type=float,
+                default=85.0,
+                help='Minimum coverage for clustering (0-100, default: 85.0)'
+            )),
+        )),
         # Standard workflow parameters
-        standard_group = parser.add_argument_group('Standard Options')
-        standard_group.add_argument(
-            '--outdir',
-            type=str,
-            default='results/',
-            help='Output directory (default: results/)'
-        )
-        standard_group.add_argument(
-            '--threads',
-            type=int,
-            help='Number of threads to use (default: auto-detect)'
-        )
-        standard_group.add_argument(
-            '--resume',
-            action='store_true',
-            help='Resume previous run'
-        )
-        standard_group.add_argument(
-            '--dry-run',
-            action='store_true',
-            help='Show command without executing'
-        )
+        ('Standard Options', (
+            ('--outdir', dict(
+                type=str,
+                default='results/',
+                help='Output directory (default: results/)'
+            )),
+            ('--threads', dict(
+                type=int,
+                help='Number of threads to use (default: auto-detect)'
+            )),
+            ('--resume', dict(
+                action='store_true',
+                help='Resume previous run'
+            )),
+            ('--dry-run', dict(
+                action='store_true',
+                help='Show command without executing'
+            )),
+            ('--validate-only', dict(
+                action='store_true',
+                help='Only validate the input and parameters, then exit '
+                     '(no configuration or database checks)'
+            )),
+        ))
+    )
+    
+    __slots__ = ('config', 'nextflow_params', '_db_root', '_db_entries')
+    
+    def __init__(self):
+        """Initialize annotation command"""
+        self.config = {}
+        self.nextflow_params = {}
+        self._db_root = None
+        self._db_entries = None
+    
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser):
+        """Add arguments to the annotation subparser"""
+        for group_title, arguments in cls.ARGUMENT_SPEC:
+            group = parser if group_title is None else parser.add_argument_group(group_title)
+            for flag, kwargs in arguments:
+                group.add_argument(flag, **kwargs)
+    
+    @staticmethod
+    def _err(message: str):
+        """Write an error message to stderr in a single unbuffered write"""
+        os.write(2, _ERR_PREFIX + message.encode() + b'\n')
     
     def _load_config(self) -> Dict:
         """Load user configuration from ~/.phorager/config.json"""
-        config_file = Path.home() / '.phorager' / 'config.json'
-        
-        if not config_file.exists():
+        try:
+            # Parsed once per process and file version by the shared reader
+            return load_phorager_config(CONFIG_FILE, {})
+        except FileNotFoundError:
             print("Warning: No configuration found. Using defaults.")
             print("Run 'phorager config set' to configure backend and locations.")
             return {
                 'backend': 'conda',
-                'db_location': str(Path.home() / 'phorager_databases'),
-                'cache_location': str(Path.home() / '.phorager' / 'cache')
+                'db_location': str(_HOME / 'phorager_databases'),
+                'cache_location': str(_HOME / '.phorager' / 'cache')
             }
-        
-        try:
-            with open(config_file, 'r') as f:
-                return json.load(f)
         except Exception as e:
-            print(f"Error loading config: {e}")
+            self._err(f"Could not load config: {e}")
             sys.exit(1)
     
     def _validate_input(self, args) -> Tuple[bool, str, str]:
@@ -175,82 +250,67 @@ class AnnotationCommand:
         Returns:
             Tuple of (is_valid, input_mode, resolved_path)
         """
+        # Validators are imported where used, so other commands do not load them
+        from utils.annotation_validation import validate_and_detect_prophage_input
+        
         is_valid, input_mode, resolved_path, error = validate_and_detect_prophage_input(args.prophage)
         
         if not is_valid:
-            print(f"Error: {error}")
+            self._err(error)
             return False, None, None
         
         return True, input_mode, resolved_path
     
     def _validate_parameters(self, args) -> bool:
         """Validate all annotation parameters"""
+        from utils.annotation_validation import (
+            validate_checkv_quality_levels,
+            validate_annotation_parameters,
+            validate_filter_mode,
+            validate_min_prophage_length,
+            validate_structural_thresholds,
+            validate_clustering_parameters
+        )
         
-        # Validate min prophage length
-        is_valid, error = validate_min_prophage_length(args.min_prophage_length)
-        if not is_valid:
-            print(f"Error: {error}")
-            return False
-        
-        # Validate CheckV quality levels
-        valid_levels, error = validate_checkv_quality_levels(args.checkv_quality_levels)
-        if error:
-            print(f"Error: {error}")
-            return False
-        
-        # Validate annotation parameter conflicts
-        is_valid, error = validate_annotation_parameters(args)
-        if not is_valid:
-            print(f"Error: {error}")
-            return False
+        # Checks run in order as (validator, *arguments); every validator
+        # returns a (result, error_message) tuple with error None on success
+        checks = [
+            (validate_min_prophage_length, args.min_prophage_length),
+            (validate_checkv_quality_levels, args.checkv_quality_levels),
+            (validate_annotation_parameters, args)
+        ]
         
         # If not skipping annotation, validate structural filtering parameters
         if not args.skip_detailed_annotation:
-            # Validate filter mode
-            is_valid, error = validate_filter_mode(args.annotation_filter_mode)
-            if not is_valid:
-                print(f"Error: {error}")
-                return False
-            
-            # Validate Pharokka thresholds
-            is_valid, error = validate_structural_thresholds(
-                args.pharokka_structural_perc,
-                args.pharokka_structural_total,
-                'Pharokka'
-            )
-            if not is_valid:
-                print(f"Error: {error}")
-                return False
-            
-            # Validate PHOLD thresholds
-            is_valid, error = validate_structural_thresholds(
-                args.phold_structural_perc,
-                args.phold_structural_total,
-                'PHOLD'
-            )
-            if not is_valid:
-                print(f"Error: {error}")
-                return False
-        
-        # Validate clustering parameters
-        is_valid, error = validate_clustering_parameters(
-            args.clustering_min_ani,
-            args.clustering_min_coverage
+            checks += [
+                (validate_filter_mode, args.annotation_filter_mode),
+                (validate_structural_thresholds,
+                 args.pharokka_structural_perc, args.pharokka_structural_total, 'Pharokka'),
+                (validate_structural_thresholds,
+                 args.phold_structural_perc, args.phold_structural_total, 'PHOLD')
+            ]
+        
+        checks.append(
+            (validate_clustering_parameters, args.clustering_min_ani, args.clustering_min_coverage)
         )
-        if not is_valid:
-            print(f"Error: {error}")
-            return False
+        
+        for validator, *validator_args in checks:
+            _, error = validator(*validator_args)
+            if error:
+                self._err(error)
+                return False
         
         # Validate threads if specified
         if args.threads is not None:
             if args.threads < 1:
-                print("Error: --threads must be at least 1")
+                self._err("--threads must be at least 1")
                 return False
         
         return True
     
     def _validate_databases(self, args) -> bool:
         """Validate required databases exist"""
+        from utils.annotation_validation import validate_databases
         
         # Determine required databases based on skip flag
         required_databases = ['checkv']  # Always needed
@@ -261,73 +321,79 @@ class AnnotationCommand:
         # Validate databases
         is_valid, missing_dbs, error = validate_databases(
             required_databases,
-            self.config['db_location']
+            self.config['db_location'],
+            existing_entries=self._get_db_entries()
         )
         
         if not is_valid:
-            print(f"Error: {error}")
             if missing_dbs:
-                print("\nMissing databases:")
-                for db in missing_dbs:
-                    print(f"  - {db}")
-                print(f"\nInstall missing databases with:")
-                print(f"  phorager install --databases {','.join(missing_dbs)}")
+                missing_list = "\n".join(f"  - {db}" for db in missing_dbs)
+                error += (
+                    f"\n\nMissing databases:\n{missing_list}\n"
+                    f"\nInstall missing databases with:\n"
+                    f"  phorager install --databases {','.join(missing_dbs)}"
+                )
+            self._err(error)
             return False
         
         return True
     
+    def _get_db_entries(self) -> Optional[frozenset]:
+        """
+        Get the names of directories in the database location, scanned once
+        
+        If the location exists but cannot be listed (e.g. execute-only
+        permissions on a shared install), the known database directories
+        are checked individually, concurrently, since stat latency on
+        network filesystems adds up.
+        
+        Returns:
+            Frozenset of directory names, or None if the location cannot be read
+        """
+        if self._db_entries is None:
+            try:
+                with os.scandir(self._db_root) as entries:
+                    self._db_entries = frozenset(entry.name for entry in entries if entry.is_dir())
+            except PermissionError:
+                self._db_entries = self._stat_db_dirs(self.DATABASE_DIRS)
+            except OSError:
+                return None
+        
+        return self._db_entries
+    
+    def _stat_db_dirs(self, dir_names: Tuple[str, ...]) -> frozenset:
+        """Return the subset of dir_names that are directories under the database location"""
+        found = paths_exist((self._db_root / name for name in dir_names), dirs_only=True)
+        return frozenset(name for name, exists in zip(dir_names, found) if exists)
+    
     def _build_nextflow_command(self, args, resolved_input: str) -> List[str]:
         """Build the Nextflow command with all parameters"""
         
         cmd = ['nextflow', 'run', 'main.nf']
         
-        # Add profile based on backend
+        # Add profile and cache location based on backend
         if self.config['backend'] == 'conda':
             cmd.extend(['-profile', 'conda'])
-        # singularity uses default profile
+            cache_flag = '--conda_cache_dir'
+        else:
+            # singularity uses default profile
+            cache_flag = '--singularity_cache_dir'
         
         # Core workflow parameters
         cmd.extend([
             '--workflow', 'annotation',
             '--prophage', resolved_input,
             '--outdir', args.outdir,
-            '--database_location', self.config['db_location']
-        ])
-        
-        # Add cache location based on backend
-        if self.config['backend'] == 'conda':
-            cmd.extend(['--conda_cache_dir', self.config['cache_location']])
-        else:
-            cmd.extend(['--singularity_cache_dir', self.config['cache_location']])
-        
-        # Quality filtering parameters (always passed)
-        cmd.extend([
-            '--min_prophage_length', str(args.min_prophage_length),
-            '--checkv_quality_levels', args.checkv_quality_levels
-        ])
-        
-        # Skip detailed annotation flag (only if True)
-        if args.skip_detailed_annotation:
-            cmd.extend(['--skip_detailed_annotation', 'true'])
-        else:
-            # Structural filtering parameters (only if NOT skipping)
-            cmd.extend([
-                '--annotation_filter_mode', args.annotation_filter_mode,
-                '--pharokka_structural_perc', str(args.pharokka_structural_perc),
-                '--pharokka_structural_total', str(args.pharokka_structural_total),
-                '--phold_structural_perc', str(args.phold_structural_perc),
-                '--phold_structural_total', str(args.phold_structural_total)
-            ])
-        
-        # Clustering parameters (always passed)
-        cmd.extend([
-            '--clustering_min_ani', str(args.clustering_min_ani),
-            '--clustering_min_coverage', str(args.clustering_min_coverage)
+            '--database_location', self.config['db_location'],
+            cache_flag, self.config['cache_location']
         ])
         
-        # Threads (only if user-specified)
-        if args.threads is not None:
-            cmd.extend(['--threads', str(args.threads)])
+        # Workflow parameters from the parameter table
+        cmd.extend(chain.from_iterable(
+            (flag, self._format_nextflow_value(getattr(args, attr)))
+            for flag, attr, include in self.NEXTFLOW_PARAMS
+            if include is None or include(args)
+        ))
         
         # Resume flag
         if args.resume:
@@ -335,98 +401,109 @@ class AnnotationCommand:
         
         return cmd
     
+    @staticmethod
+    def _format_nextflow_value(value) -> str:
+        """Format a parameter value for the Nextflow command line"""
+        if value is True:
+            return 'true'
+        if isinstance(value, list):
+            return ','.join(value)
+        return str(value)
+    
     def _display_dry_run(self, args, input_mode: str, resolved_input: str, cmd: List[str]):
         """Display dry-run information"""
         
-        print("Annotation Workflow - Dry Run")
-        print("=" * 50)
-        print()
-        
         # Input detection
-        print("Input Detection:")
         if input_mode == 'prophage_workflow':
-            print("  ✓ Prophage workflow results detected")
+            detected = "Prophage workflow results detected"
         elif input_mode == 'direct_subdir':
-            print("  ✓ Direct subdirectory detected")
+            detected = "Direct subdirectory detected"
         else:  # single_file
-            print("  ✓ Single FASTA file detected")
-        print(f"  Input: {resolved_input}")
-        print()
-        
-        # Configuration
-        print("Configuration:")
-        print(f"  Backend: {self.config['backend']}")
-        print(f"  Database location: {self.config['db_location']}")
-        print(f"  Cache location: {self.config['cache_location']}")
-        print(f"  Output directory: {args.outdir}")
-        if args.threads:
-            print(f"  Threads: {args.threads}")
-        else:
-            print(f"  Threads: auto-detected")
-        print()
-        
-        # Quality filtering
-        print("Quality Filtering (CheckV):")
-        print(f"  Min prophage length: {args.min_prophage_length} bp")
-        print(f"  Quality levels: {args.checkv_quality_levels}")
-        print()
+            detected = "Single FASTA file detected"
+        
+        threads = args.threads if args.threads else "auto-detected"
+        
+        lines = [
+            "Annotation Workflow - Dry Run",
+            "=" * 50,
+            "",
+            "Input Detection:",
+            f"  ✓ {detected}",
+            f"  Input: {resolved_input}",
+            "",
+            # Configuration
+            "Configuration:",
+            f"  Backend: {self.config['backend']}",
+            f"  Database location: {self.config['db_location']}",
+            f"  Cache location: {self.config['cache_location']}",
+            f"  Output directory: {args.outdir}",
+            f"  Threads: {threads}",
+            "",
+            # Quality filtering
+            "Quality Filtering (CheckV):",
+            f"  Min prophage length: {args.min_prophage_length} bp",
+            f"  Quality levels: {','.join(args.checkv_quality_levels)}",
+            ""
+        ]
         
         # Annotation pipeline
-        print("Annotation Pipeline:")
-        print("  ✓ CheckV - Quality assessment")
         if args.skip_detailed_annotation:
-            print("  ✗ Pharokka - Skipped (--skip-detailed-annotation)")
-            print("  ✗ PHOLD - Skipped (--skip-detailed-annotation)")
-            print("  ✗ Structural filtering - Skipped (--skip-detailed-annotation)")
-            print("  ✓ ANI clustering (CheckV-filtered sequences)")
+            lines += self.PIPELINE_SKIP
         else:
-            print("  ✓ Pharokka - Functional annotation")
-            print("  ✓ PHOLD - Structure prediction")
-            print("  ✓ Structural filtering (combined mode)")
-            print("  ✓ ANI clustering")
-        print()
-        
-        # Structural filtering details (if applicable)
-        if not args.skip_detailed_annotation:
-            print("Structural Filtering:")
-            mode_desc = {
-                'pharokka': 'Pharokka criteria only',
-                'phold': 'PHOLD criteria only',
-                'combined': 'pass if Pharokka OR PHOLD criteria met'
-            }
-            print(f"  Mode: {args.annotation_filter_mode} ({mode_desc[args.annotation_filter_mode]})")
-            print(f"  Pharokka thresholds: ≥{args.pharokka_structural_perc}% structural genes AND ≥{args.pharokka_structural_total} total")
-            print(f"  PHOLD thresholds: ≥{args.phold_structural_perc}% structural genes AND ≥{args.phold_structural_total} total")
-            print()
+            lines += self.PIPELINE_FULL
+            lines += [
+                # Structural filtering details
+                "Structural Filtering:",
+                f"  Mode: {args.annotation_filter_mode} ({self.FILTER_MODE_DESCRIPTIONS[args.annotation_filter_mode]})",
+                f"  Pharokka thresholds: ≥{args.pharokka_structural_perc}% structural genes AND ≥{args.pharokka_structural_total} total",
+                f"  PHOLD thresholds: ≥{args.phold_structural_perc}% structural genes AND ≥{args.phold_structural_total} total",
+                ""
+            ]
         
         # Clustering
-        print("Clustering Parameters:")
-        print(f"  Min ANI: {args.clustering_min_ani}%")
-        print(f"  Min coverage: {args.clustering_min_coverage}%")
-        print()
+        lines += [
+            "Clustering Parameters:",
+            f"  Min ANI: {args.clustering_min_ani}%",
+            f"  Min coverage: {args.clustering_min_coverage}%",
+            ""
+        ]
         
         # Database status
-        print("Databases Required:")
-        checkv_db = Path(self.config['db_location']) / 'checkv_database'
-        print(f"  {'✓' if checkv_db.exists() else '✗'} CheckV: {checkv_db}")
+        db_entries = self._get_db_entries() or frozenset()
+        
+        def db_line(label: str, dir_name: str) -> str:
+            status = '✓' if dir_name in db_entries else '✗'
+            return f"  {status} {label}: {self._db_root / dir_name}"
+        
+        lines += [
+            "Databases Required:",
+            db_line('CheckV', 'checkv_database')
+        ]
         
         if not args.skip_detailed_annotation:
-            pharokka_db = Path(self.config['db_location']) / 'pharokka_database'
-            phold_db = Path(self.config['db_location']) / 'phold_database'
-            print(f"  {'✓' if pharokka_db.exists() else '✗'} Pharokka: {pharokka_db}")
-            print(f"  {'✓' if phold_db.exists() else '✗'} PHOLD: {phold_db}")
-        print()
+            lines += [
+                db_line('Pharokka', 'pharokka_database'),
+                db_line('PHOLD', 'phold_database')
+            ]
         
         # Nextflow command
-        print("Nextflow Command:")
-        print(f"  {' '.join(cmd)}")
+        lines += [
+            "",
+            "Nextflow Command:",
+            f"  {' '.join(cmd)}"
+        ]
+        
+        # Emit the whole report with a single write
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def run(self, args) -> bool:
         """Execute the annotation command"""
         
         try:
-            # Load configuration
-            self.config = self._load_config()
+            # Load configuration (not needed to only validate the arguments)
+            if not args.validate_only:
+                self.config = self._load_config()
+                self._db_root = Path(self.config['db_location'])
             
             # Validate input and detect mode
             success, input_mode, resolved_input = self._validate_input(args)
@@ -437,6 +514,11 @@ class AnnotationCommand:
             if not self._validate_parameters(args):
                 return False
             
+            # Stop before the database checks when only validating
+            if args.validate_only:
+                print("Input and parameters are valid.")
+                return True
+            
             # Validate databases
             if not self._validate_databases(args):
                 return False
@@ -457,31 +539,28 @@ class AnnotationCommand:
                 return True
             
             # Check Nextflow availability
-            try:
-                subprocess.run(['nextflow', '-version'], 
-                             capture_output=True, 
-                             check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                print("Error: Nextflow not found. Please install Nextflow first.")
-                print("Visit: https://www.nextflow.io/docs/latest/getstarted.html")
+            if not nextflow_available():
+                self._err("Nextflow not found. Please install Nextflow first.\n"
+                          "Visit: https://www.nextflow.io/docs/latest/getstarted.html")
                 return False
             
             # Change to phorager directory before running nextflow
-            phorager_dir = Path(sys.argv[0]).resolve().parent
-            os.chdir(phorager_dir)
+            os.chdir(_PHORAGER_DIR)
 
             # Execute Nextflow
             print("Starting annotation workflow...")
             print(f"Command: {' '.join(cmd)}")
             print()
             
-            result = subprocess.run(cmd)
-            
-            if result.returncode == 0:
-                print("\nAnnotation workflow completed successfully!")
-                return True
-            else:
-                print("\nAnnotation workflow failed!")
+            # Replace this process with Nextflow so no Python interpreter
+            # stays resident for the whole run; Nextflow's exit status and
+            # signal handling (e.g. Ctrl-C) become those of phorager itself
+            sys.stdout.flush()
+            sys.stderr.flush()
+            try:
+                os.execvp(cmd[0], cmd)
+            except OSError as e:
+                self._err(f"Could not start Nextflow: {e}")
                 return False
         
         except KeyboardInterrupt:
@@ -6,18 +6,68 @@ Performs CheckM2 quality assessment, filtering, and dRep dereplication.
 """
 
 import argparse
-import json
+import functools
+import os
 import sys
-import subprocess
-import multiprocessing
 from pathlib import Path
 from typing import List, Optional
 
+from ._config_io import CONFIG_DIR, CONFIG_FILE, load_phorager_config
 from utils.bacterial_validation import (
     validate_genome_input, validate_parameter_ranges,
-    validate_output_directory, validate_threads
+    validate_output_directory, validate_threads, cpu_count
 )
 
+# Extensions recognised as genome FASTA files
+GENOME_EXTENSIONS = frozenset(('.fa', '.fasta', '.fna'))
+
+# Single pattern for all parameters read from nextflow.config; the named
+# group that matched tells which parameter was found
+_NEXTFLOW_PARAMS_PATTERN = (
+    r'outdir\s*=\s*[\'"](?P<outdir>[^\'"]+)[\'"]'
+    r'|database_location\s*=\s*[\'"](?P<database_location>[^\'"]+)[\'"]'
+    r'|threads\s*=\s*(?:(?P<threads_auto>Runtime\.runtime\.availableProcessors\(\))|(?P<threads>\d+))'
+    r'|completeness_threshold\s*=\s*(?P<completeness_threshold>\d+\.?\d*)'
+    r'|contamination_threshold\s*=\s*(?P<contamination_threshold>\d+\.?\d*)'
+    r'|drep_ani_threshold\s*=\s*(?P<drep_ani_threshold>\d+\.?\d*)'
+)
+
+
+# The mtime_ns argument is part of the cache key only: an edited file has a
+# new mtime and is therefore parsed again.
+@functools.lru_cache(maxsize=8)
+def _parse_nextflow_config(path_str: str, mtime_ns: int) -> dict:
+    """Extract workflow defaults from nextflow.config (cached per path and mtime)"""
+    import re
+    
+    with open(path_str, 'r') as f:
+        content = f.read()
+    
+    # Keep the first occurrence of each parameter
+    found = {}
+    for match in re.finditer(_NEXTFLOW_PARAMS_PATTERN, content):
+        for key, value in match.groupdict().items():
+            if value is not None:
+                found.setdefault(key, value)
+                break
+    
+    defaults = {
+        'outdir': found.get('outdir', 'results'),
+        'database_location': found.get('database_location', 'databases')
+    }
+    
+    # Threads: only a fixed number is recorded here; availableProcessors()
+    # or no setting at all is resolved by the caller when needed
+    if 'threads_auto' not in found and 'threads' in found:
+        defaults['threads'] = int(found['threads'])
+    
+    # Thresholds
+    defaults['completeness_threshold'] = float(found['completeness_threshold']) if 'completeness_threshold' in found else 95
+    defaults['contamination_threshold'] = float(found['contamination_threshold']) if 'contamination_threshold' in found else 5
+    defaults['drep_ani_threshold'] = float(found['drep_ani_threshold']) if 'drep_ani_threshold' in found else 0.999
+    
+    return defaults
+
 
 class BacterialCommand:
     """
@@ -27,8 +77,9 @@ class BacterialCommand:
     def __init__(self):
         """Initialize bacterial command"""
         # Config file location (same as other commands)
-        self.config_dir = Path.home() / '.phorager'
-        self.config_file = self.config_dir / 'config.json'
+        self.config_dir = CONFIG_DIR
+        self.config_file = CONFIG_FILE
+        self._config_file_str = os.fspath(self.config_file)
     
     @staticmethod
     def add_arguments(parser: argparse.ArgumentParser):
@@ -89,82 +140,53 @@ class BacterialCommand:
             'cache_location': './cache'       # Changed from None
         }
         
-        if not self.config_file.exists():
-            return default_config
-        
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
-            
-            # Merge with defaults - fills in any missing keys
-            for key, value in default_config.items():
-                config.setdefault(key, value)
-            
-            return config
-                
-        except (json.JSONDecodeError, OSError):
+            return load_phorager_config(self._config_file_str, default_config)
+        except FileNotFoundError:
+            return default_config
+        except (ValueError, OSError):
+            # ValueError covers JSON decode errors without importing json here
             print("Warning: Could not read config file. Using defaults.")
             return default_config
 
-    def _load_nextflow_defaults(self) -> dict:
-        """Load defaults from Nextflow configuration"""
+    def _load_nextflow_defaults(self, need_threads: bool = False) -> dict:
+        """
+        Load defaults from Nextflow configuration
+        
+        Args:
+            need_threads: Include a 'threads' default; this is skipped unless
+                requested since Nextflow detects the thread count itself
+        """
+        defaults = self._read_nextflow_defaults()
+        if need_threads and 'threads' not in defaults:
+            defaults['threads'] = cpu_count()
+        return defaults
+    
+    def _read_nextflow_defaults(self) -> dict:
+        """Read defaults from nextflow.config, falling back to built-in values"""
         try:
             # Try to read nextflow.config from current directory
             config_path = Path.cwd() / 'nextflow.config'
-            if not config_path.exists():
+            try:
+                mtime_ns = os.stat(config_path).st_mtime_ns
+            except FileNotFoundError:
                 # Fallback to basic defaults if nextflow.config not found
                 return {
                     'outdir': 'results',
                     'database_location': 'databases',
-                    'threads': multiprocessing.cpu_count(),
                     'completeness_threshold': 95,
                     'contamination_threshold': 5,
                     'drep_ani_threshold': 0.999
                 }
             
             # Parse key parameters from nextflow.config
-            with open(config_path, 'r') as f:
-                content = f.read()
-            
-            # Simple regex-based extraction of key parameters
-            import re
-            
-            defaults = {}
-            
-            # Extract outdir
-            outdir_match = re.search(r'outdir\s*=\s*[\'"]([^\'"]+)[\'"]', content)
-            defaults['outdir'] = outdir_match.group(1) if outdir_match else 'results'
-            
-            # Extract database_location
-            db_match = re.search(r'database_location\s*=\s*[\'"]([^\'"]+)[\'"]', content)
-            defaults['database_location'] = db_match.group(1) if db_match else 'databases'
-            
-            # Extract threads (handle Runtime.runtime.availableProcessors())
-            threads_match = re.search(r'threads\s*=\s*Runtime\.runtime\.availableProcessors\(\)', content)
-            if threads_match:
-                defaults['threads'] = multiprocessing.cpu_count()
-            else:
-                threads_num_match = re.search(r'threads\s*=\s*(\d+)', content)
-                defaults['threads'] = int(threads_num_match.group(1)) if threads_num_match else multiprocessing.cpu_count()
-            
-            # Extract thresholds
-            comp_match = re.search(r'completeness_threshold\s*=\s*(\d+\.?\d*)', content)
-            defaults['completeness_threshold'] = float(comp_match.group(1)) if comp_match else 95
-            
-            cont_match = re.search(r'contamination_threshold\s*=\s*(\d+\.?\d*)', content)
-            defaults['contamination_threshold'] = float(cont_match.group(1)) if cont_match else 5
-            
-            ani_match = re.search(r'drep_ani_threshold\s*=\s*(\d+\.?\d*)', content)
-            defaults['drep_ani_threshold'] = float(ani_match.group(1)) if ani_match else 0.999
-            
-            return defaults
+            return dict(_parse_nextflow_config(str(config_path), mtime_ns))
             
         except Exception as e:
             print(f"Warning: Could not parse nextflow.config ({e}). Using built-in defaults.")
             return {
                 'outdir': 'results',
                 'database_location': 'databases', 
-                'threads': multiprocessing.cpu_count(),
                 'completeness_threshold': 95,
                 'contamination_threshold': 5,
                 'drep_ani_threshold': 0.999
@@ -229,7 +251,12 @@ class BacterialCommand:
         Returns:
             List of command components
         """
-        cmd = ['nextflow', 'run', 'main.nf']
+        cmd = ['nextflow', 'run']
+        
+        # Add behavior flags (resume goes right after 'run')
+        if args.resume:
+            cmd.append('-resume')
+        cmd.append('main.nf')
         
         # Add profile based on backend
         if params['backend'] == 'conda':
@@ -261,85 +288,82 @@ class BacterialCommand:
                 cmd.extend(['--conda_cache_dir', cache_location])
             else:
                 cmd.extend(['--singularity_cache_dir', cache_location])
-
-        # Add behavior flags
-        if args.resume:
-            cmd.insert(2, '-resume')  # Resume goes right after 'run'
         
         return cmd
     
     def _execute_nextflow(self, cmd: List[str]) -> bool:
-        """Execute the nextflow command"""
+        """
+        Execute the nextflow command
+        
+        The current process is replaced by Nextflow, so no Python interpreter
+        stays resident for the whole workflow; Nextflow's exit status and
+        signal handling (e.g. Ctrl-C) become those of phorager itself.
+        Only returns (with False) if Nextflow could not be started.
+        """
+        print(f"Executing: {' '.join(cmd)}")
+        sys.stdout.flush()
+        sys.stderr.flush()
         try:
-            print(f"Executing: {' '.join(cmd)}")
-            result = subprocess.run(
-                cmd, 
-                text=True,
-                cwd=Path.cwd()  # Run from current directory
-            )
-            
-            if result.returncode == 0:
-                print("Bacterial workflow completed successfully!")
-                return True
-            else:
-                print(f"Bacterial workflow failed with exit code: {result.returncode}")
-                return False
-                
+            os.execvp(cmd[0], cmd)
         except FileNotFoundError:
             print("Error: Nextflow not found. Please ensure Nextflow is installed and in your PATH.")
-            return False
-        except Exception as e:
+        except OSError as e:
             print(f"Error executing Nextflow: {e}")
-            return False
+        return False
     
     def _show_workflow_plan(self, params: dict, cmd: List[str]):
         """Show what would be executed in dry-run mode"""
-        print("Phorager Bacterial Workflow Plan")
-        print("=" * 35)
-        print()
+        lines = ["Phorager Bacterial Workflow Plan", "=" * 35, ""]
         
         # Show configuration
-        print("Configuration:")
-        print(f"  Backend: {params['backend']}")
-        print(f"  Database location: {params['database_location']}")
+        lines.append("Configuration:")
+        lines.append(f"  Backend: {params['backend']}")
+        lines.append(f"  Database location: {params['database_location']}")
         if params['cache_location']:
-            print(f"  Cache location: {params['cache_location']}")
+            lines.append(f"  Cache location: {params['cache_location']}")
         else:
-            print("  Cache location: (pipeline default)")
-        print()
+            lines.append("  Cache location: (pipeline default)")
+        lines.append("")
         
         # Show input information
+        lines.append("Input:")
         genome_path = Path(params['genome'])
         if genome_path.is_file():
-            print("Input:")
-            print(f"  Genome file: {params['genome']}")
+            lines.append(f"  Genome file: {params['genome']}")
         else:
-            # Count genome files in directory
-            genome_files = []
-            for ext in ['.fa', '.fasta', '.fna']:
-                genome_files.extend(list(genome_path.glob(f'*{ext}')))
-            print("Input:")
-            print(f"  Genome directory: {params['genome']} ({len(genome_files)} files found)")
-        print()
+            # Count genome files in directory in one pass; like the
+            # glob('*<ext>') calls this replaced, any entry whose name ends
+            # with a genome extension counts, hidden or not
+            genome_count = 0
+            with os.scandir(genome_path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name[name.rfind('.'):] in GENOME_EXTENSIONS:
+                        genome_count += 1
+            lines.append(f"  Genome directory: {params['genome']} ({genome_count} files found)")
+        lines.append("")
         
         # Show parameters
-        print("Workflow Parameters:")
-        print(f"  Completeness threshold: {params['completeness_threshold']}%")
-        print(f"  Contamination threshold: {params['contamination_threshold']}%") 
-        print(f"  dRep ANI threshold: {params['drep_ani_threshold']}")
-        print(f"  Output directory: {params['outdir']}")
+        lines.append("Workflow Parameters:")
+        lines.append(f"  Completeness threshold: {params['completeness_threshold']}%")
+        lines.append(f"  Contamination threshold: {params['contamination_threshold']}%")
+        lines.append(f"  dRep ANI threshold: {params['drep_ani_threshold']}")
+        lines.append(f"  Output directory: {params['outdir']}")
         if params['threads'] is not None:
-            print(f"  Threads: {params['threads']}")
+            lines.append(f"  Threads: {params['threads']}")
         else:
-            print(f"  Threads: (using Nextflow default - auto-detected)")
-        print()
+            lines.append("  Threads: (using Nextflow default - auto-detected)")
+        lines.append("")
         
         # Show nextflow command
-        print("Nextflow command that would be executed:")
-        print(f"  {' '.join(cmd)}")
-        print()
+        lines.append("Nextflow command that would be executed:")
+        lines.append(f"  {' '.join(cmd)}")
+        lines.append("")
+        
+        lines.append("NOTE: This is a dry-run. Use without --dry-run to execute.")
         
-        print("NOTE: This is a dry-run. Use without --dry-run to execute.")
+        # Emit the whole plan with a single write
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def run(self, args) -> bool:
         """Execute the bacterial command"""
@@ -359,10 +383,9 @@ class BacterialCommand:
                 phorager_dir = Path(sys.argv[0]).resolve().parent
                 os.chdir(phorager_dir)
                 
-                # Execute nextflow command
+                # Execute nextflow command (does not return on success)
                 print("Executing bacterial workflow...")
-                success = self._execute_nextflow(nextflow_cmd)
-                return success
+                return self._execute_nextflow(nextflow_cmd)
         
         except ValueError as e:
             print(f"Error: {e}")
@@ -6,10 +6,12 @@ Manages persistent user preferences like backend selection and installation loca
 """
 
 import os
-import json
+import sys
 import argparse
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+from ._config_io import CONFIG_DIR, CONFIG_FILE, load_phorager_config
 
 
 class ConfigCommand:
@@ -24,13 +26,22 @@ class ConfigCommand:
         'cache_location': None  # Will use nextflow.config defaults if None
     }
     
+    # Display labels for the known configuration keys
+    CONFIG_LABELS = {
+        'backend': 'Backend',
+        'db_location': 'Db Location',
+        'cache_location': 'Cache Location'
+    }
+    
     # Valid configuration values
     VALID_BACKENDS = ['conda', 'singularity']
+    VALID_BACKENDS_SET = frozenset(VALID_BACKENDS)
     
     def __init__(self):
         """Initialize config command"""
-        self.config_dir = Path.home() / '.phorager'
-        self.config_file = self.config_dir / 'config.json'
+        self.config_dir = CONFIG_DIR
+        self.config_file = CONFIG_FILE
+        self._config_file_str = os.fspath(self.config_file)
     
     @staticmethod
     def add_arguments(parser: argparse.ArgumentParser):
@@ -91,62 +102,103 @@ class ConfigCommand:
         """Ensure configuration directory exists"""
         self.config_dir.mkdir(exist_ok=True)
     
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file, return defaults if file doesn't exist"""
-        if not self.config_file.exists():
-            return self.DEFAULT_CONFIG.copy()
+    def _load_config(self) -> Tuple[Dict[str, Any], bool]:
+        """
+        Load configuration from file, return defaults if file doesn't exist
         
+        Returns:
+            Tuple of (config, whether the config file exists)
+        """
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
-            
-            # Merge with defaults to handle missing keys
-            merged_config = self.DEFAULT_CONFIG.copy()
-            merged_config.update(config)
-            return merged_config
-            
-        except (json.JSONDecodeError, OSError) as e:
+            return load_phorager_config(self._config_file_str, self.DEFAULT_CONFIG), True
+        except FileNotFoundError:
+            return self.DEFAULT_CONFIG.copy(), False
+        except (ValueError, OSError) as e:
+            # ValueError covers JSON decode errors without importing json here
             print(f"Warning: Could not read config file ({e}). Using defaults.")
-            return self.DEFAULT_CONFIG.copy()
+            return self.DEFAULT_CONFIG.copy(), True
     
     def _save_config(self, config: Dict[str, Any]):
-        """Save configuration to file"""
+        """
+        Save configuration to file
+        
+        The file is written to a temporary name and moved into place, so an
+        interrupted save never leaves a truncated config behind. The existing
+        file keeps its permissions, and a symlinked config is written through
+        to its target.
+        """
+        try:
+            import orjson
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        except ImportError:
+            import json
+            data = json.dumps(config, indent=2).encode()
+        
         self._ensure_config_dir()
         
+        config_file = os.path.realpath(self._config_file_str)
+        tmp_file = f"{config_file}.{os.getpid()}.tmp"
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                try:
+                    os.fchmod(fd, os.stat(config_file).st_mode & 0o7777)
+                except FileNotFoundError:
+                    pass
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, config_file)
         except OSError as e:
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
             raise RuntimeError(f"Could not save configuration: {e}")
     
-    def _validate_config(self, config: Dict[str, Any]):
-        """Validate configuration values"""
+    def _validate_config(self, config: Dict[str, Any], changed_paths: Optional[Dict[str, Path]] = None):
+        """
+        Validate configuration values
+        
+        Args:
+            config: Configuration to validate (paths are updated in place)
+            changed_paths: Resolved paths of the locations being changed; when
+                given, only these are checked since stored locations were
+                already validated when they were set
+        """
         # Validate backend
-        if config.get('backend') not in self.VALID_BACKENDS:
+        if config.get('backend') not in self.VALID_BACKENDS_SET:
             raise ValueError(f"Invalid backend. Must be one of: {', '.join(self.VALID_BACKENDS)}")
         
+        if changed_paths is None:
+            changed_paths = {
+                path_key: Path(config[path_key]).expanduser().resolve()
+                for path_key in ['db_location', 'cache_location']
+                if config.get(path_key) is not None
+            }
+        
         # Validate paths if provided
-        for path_key in ['db_location', 'cache_location']:
-            path_value = config.get(path_key)
-            if path_value is not None:
-                path_obj = Path(path_value).expanduser().resolve()
-                
-                # Check if path exists or can be created
-                try:
-                    path_obj.mkdir(parents=True, exist_ok=True)
-                except OSError as e:
-                    raise ValueError(f"Invalid {path_key.replace('_', ' ')}: {e}")
-                
-                # Update config with resolved path
-                config[path_key] = str(path_obj)
+        for path_key, path_obj in changed_paths.items():
+            # Check if path exists or can be created
+            try:
+                path_obj.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                raise ValueError(f"Invalid {path_key.replace('_', ' ')}: {e}")
+            
+            # Update config with resolved path
+            config[path_key] = str(path_obj)
     
     def set_config(self, args) -> None:
         """Set configuration values"""
         # Load current config
-        config = self._load_config()
+        config, _ = self._load_config()
         
         # Update with provided values
         changes_made = False
+        changed_paths = {}
         
         if args.backend is not None:
             if config['backend'] != args.backend:
@@ -159,6 +211,7 @@ class ConfigCommand:
             db_path = Path(args.db_location).expanduser().resolve()
             if config['db_location'] != str(db_path):
                 config['db_location'] = str(db_path)
+                changed_paths['db_location'] = db_path
                 changes_made = True
                 print(f"Database location set to: {db_path}")
         
@@ -167,6 +220,7 @@ class ConfigCommand:
             cache_path = Path(args.cache_location).expanduser().resolve()
             if config['cache_location'] != str(cache_path):
                 config['cache_location'] = str(cache_path)
+                changed_paths['cache_location'] = cache_path
                 changes_made = True
                 print(f"Cache location set to: {cache_path}")
         
@@ -174,8 +228,8 @@ class ConfigCommand:
             print("No configuration changes specified.")
             return
         
-        # Validate configuration
-        self._validate_config(config)
+        # Validate configuration (only the locations that changed)
+        self._validate_config(config, changed_paths)
         
         # Save configuration
         self._save_config(config)
@@ -183,25 +237,22 @@ class ConfigCommand:
     
     def show_config(self, args) -> None:
         """Show current configuration"""
-        config = self._load_config()
+        config, config_exists = self._load_config()
         
         if args.json:
+            import json
             print(json.dumps(config, indent=2))
         else:
-            print("Phorager Configuration:")
-            print("=" * 24)
-            
-            for key, value in config.items():
-                display_key = key.replace('_', ' ').title()
-                if value is None:
-                    display_value = "(using pipeline defaults)"
-                else:
-                    display_value = value
-                print(f"{display_key:<20}: {display_value}")
-            
-            print(f"\nConfig file: {self.config_file}")
-            if not self.config_file.exists():
-                print("(Config file does not exist - showing defaults)")
+            lines = ["Phorager Configuration:", "=" * 24]
+            lines.extend(
+                f"{self.CONFIG_LABELS.get(key) or key.replace('_', ' ').title():<20}: "
+                f"{'(using pipeline defaults)' if value is None else value}"
+                for key, value in config.items()
+            )
+            lines.append(f"\nConfig file: {self.config_file}")
+            if not config_exists:
+                lines.append("(Config file does not exist - showing defaults)")
+            sys.stdout.write('\n'.join(lines) + '\n')
     
     def reset_config(self, args) -> None:
         """Reset configuration to defaults"""
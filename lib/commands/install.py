@@ -6,17 +6,31 @@ Supports all bacterial genome, prophage detection, and annotation tools.
 """
 
 import argparse
-import json
 import sys
 import subprocess
 from pathlib import Path
 from typing import List, Optional
 
-from utils.install_validation import (
-    validate_tools_list, validate_databases_list, 
-    get_available_tools_summary, calculate_total_database_size,
-    TOOL_DESCRIPTIONS, DATABASE_SIZES
-)
+from ._config_io import CONFIG_DIR, CONFIG_FILE, load_phorager_config
+from ._nextflow import nextflow_common_args
+from ._output import output_suppressed
+
+
+class InstallValidationError(ValueError):
+    """
+    Invalid tool or database selection
+    
+    The summary of available tools and databases is appended when the error
+    is rendered, so it is only built if the message is actually shown.
+    """
+    
+    def __init__(self, errors: List[str]):
+        super().__init__(errors)
+        self.errors = errors
+    
+    def __str__(self) -> str:
+        from utils.install_validation import get_available_tools_summary
+        return "\n".join(self.errors + ["\n" + get_available_tools_summary()])
 
 
 class InstallCommand:
@@ -27,8 +41,8 @@ class InstallCommand:
     def __init__(self):
         """Initialize install command"""
         # Config file location (same as config command)
-        self.config_dir = Path.home() / '.phorager'
-        self.config_file = self.config_dir / 'config.json'
+        self.config_dir = CONFIG_DIR
+        self.config_file = CONFIG_FILE
     
     @staticmethod
     def add_arguments(parser: argparse.ArgumentParser):
@@ -68,29 +82,15 @@ class InstallCommand:
             'cache_location': './cache'        # Changed from None
         }
         
-        if not self.config_file.exists():
-            return default_config
-        
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
-            
-            # Merge with defaults - fills in any missing keys
-            for key, value in default_config.items():
-                config.setdefault(key, value)
-            
-            return config
-                
-        except (json.JSONDecodeError, OSError):
+            return load_phorager_config(self.config_file, default_config)
+        except FileNotFoundError:
+            return default_config
+        except (ValueError, OSError):
+            # ValueError covers JSON decode errors
             print("Warning: Could not read config file. Using defaults.")
             return default_config
 
-    def _parse_tool_list(self, tools_str: str) -> List[str]:
-        """Parse comma-separated tool list"""
-        if not tools_str:
-            return []
-        return [tool.strip() for tool in tools_str.split(',') if tool.strip()]
-    
     def _validate_parameters(self, args) -> tuple[List[str], List[str]]:
         """
         Validate install parameters and return validated tools and databases
@@ -98,39 +98,32 @@ class InstallCommand:
         Returns:
             Tuple of (validated_tools, validated_databases)
         """
+        # Validators are imported on use so other commands never load them
+        from utils.install_validation import (
+            parse_and_validate_tools, parse_and_validate_databases
+        )
+        
         errors = []
         
-        # Parse tool and database lists
-        tools_list = self._parse_tool_list(args.tools) if args.tools else []
-        databases_list = self._parse_tool_list(args.databases) if args.databases else []
+        # Parse and validate tool and database lists in one pass each
+        validated_tools, invalid_tools = parse_and_validate_tools(args.tools)
+        validated_databases, invalid_databases = parse_and_validate_databases(args.databases)
         
         # Check if anything was specified
-        if not tools_list and not databases_list:
+        if not (validated_tools or invalid_tools or validated_databases or invalid_databases):
             errors.append("No tools or databases specified for installation.")
             errors.append("Use --tools and/or --databases to specify what to install.")
             errors.append("Use --list-available to see available options.")
             raise ValueError("\n".join(errors))
         
-        # Validate tools
-        validated_tools = []
-        if tools_list:
-            valid_tools, invalid_tools = validate_tools_list(tools_list)
-            if invalid_tools:
-                errors.append(f"Invalid tools: {', '.join(invalid_tools)}")
-            validated_tools = valid_tools
-        
-        # Validate databases
-        validated_databases = []
-        if databases_list:
-            valid_databases, invalid_databases = validate_databases_list(databases_list)
-            if invalid_databases:
-                errors.append(f"Invalid databases: {', '.join(invalid_databases)}")
-            validated_databases = valid_databases
+        if invalid_tools:
+            errors.append(f"Invalid tools: {', '.join(invalid_tools)}")
+        if invalid_databases:
+            errors.append(f"Invalid databases: {', '.join(invalid_databases)}")
         
         # If there were validation errors, show available options
         if errors:
-            errors.append("\n" + get_available_tools_summary())
-            raise ValueError("\n".join(errors))
+            raise InstallValidationError(errors)
         
         return validated_tools, validated_databases
     
@@ -148,15 +141,8 @@ class InstallCommand:
         Returns:
             List of command components
         """
-        cmd = ['nextflow', 'run', 'main.nf']
-        
-        # Add profile based on backend
-        if config['backend'] == 'conda':
-            cmd.extend(['-profile', 'conda'])
-        # singularity is the default profile, no need to specify
-        
-        # Add workflow
-        cmd.extend(['--workflow', 'install'])
+        # Backend profile and locations, then the install workflow
+        cmd = ['nextflow', 'run', 'main.nf', *nextflow_common_args(config), '--workflow', 'install']
         
         # Add tools and databases (sorted for consistency)
         if tools:
@@ -164,27 +150,22 @@ class InstallCommand:
         if databases:
             cmd.extend(['--databases', ','.join(sorted(databases))])
         
-        # Add location parameters if configured
-        if config.get('db_location'):
-            cmd.extend(['--database_location', config['db_location']])
-
-        cache_location = config.get('cache_location')
-        if cache_location:
-            if config['backend'] == 'conda':
-                cmd.extend(['--conda_cache_dir', cache_location])
-            else:
-                cmd.extend(['--singularity_cache_dir', cache_location])
-        
         return cmd
     
-    def _execute_nextflow(self, cmd: List[str]) -> bool:
-        """Execute the nextflow command"""
+    def _execute_nextflow(self, cmd: List[str], cwd: Path) -> bool:
+        """
+        Execute the nextflow command
+        
+        Args:
+            cmd: Command to run
+            cwd: Directory to run it from (the phorager directory with main.nf)
+        """
         try:
             print(f"Executing: {' '.join(cmd)}")
             result = subprocess.run(
                 cmd, 
                 text=True,
-                cwd=Path.cwd()  # Run from current directory
+                cwd=cwd
             )
             
             if result.returncode == 0:
@@ -204,50 +185,61 @@ class InstallCommand:
     def _show_installation_plan(self, config: dict, tools: List[str], 
                                databases: List[str], cmd: List[str]):
         """Show what would be installed with enhanced formatting"""
-        print("\nPhorager Installation Plan")
-        print("=" * 50)
-        print()
+        # Nothing to show when the output is discarded
+        if output_suppressed():
+            return
+        
+        from utils.install_validation import (
+            calculate_total_database_size, TOOL_DESCRIPTIONS, DATABASE_SIZES
+        )
+        
+        lines = ["", "Phorager Installation Plan", "=" * 50, ""]
         
         # Show configuration
-        print("Configuration:")
-        print(f"  Backend: {config['backend']}")
-        print(f"  Database location: {config['db_location'] or '(pipeline default)'}")
-        print(f"  Cache location: {config['cache_location'] or '(pipeline default)'}")
-        print()
+        lines.append("Configuration:")
+        lines.append(f"  Backend: {config['backend']}")
+        lines.append(f"  Database location: {config['db_location'] or '(pipeline default)'}")
+        lines.append(f"  Cache location: {config['cache_location'] or '(pipeline default)'}")
+        lines.append("")
         
         # Show tools with descriptions
         if tools:
-            print(f"Tools to install ({len(tools)}):")
-            for tool in sorted(tools):
-                desc = TOOL_DESCRIPTIONS.get(tool, 'No description')
-                print(f"  - {tool:15} ({desc})")
-            print()
+            lines.append(f"Tools to install ({len(tools)}):")
+            lines.extend(
+                f"  - {tool:15} ({TOOL_DESCRIPTIONS.get(tool, 'No description')})"
+                for tool in sorted(tools)
+            )
+            lines.append("")
         
         # Show databases with sizes and descriptions
         if databases:
-            print(f"Databases to install ({len(databases)}):")
-            for db in sorted(databases):
-                size = DATABASE_SIZES.get(db, '?')
-                desc = TOOL_DESCRIPTIONS.get(db, 'No description')
-                print(f"  - {db:15} (~{size:>6}) - {desc}")
-            print()
+            lines.append(f"Databases to install ({len(databases)}):")
+            lines.extend(
+                f"  - {db:15} (~{DATABASE_SIZES.get(db, '?'):>6}) - {TOOL_DESCRIPTIONS.get(db, 'No description')}"
+                for db in sorted(databases)
+            )
+            lines.append("")
             
             # Show total download size
             total_size = calculate_total_database_size(databases)
-            print(f"Total estimated download: ~{total_size}")
-            print()
+            lines.append(f"Total estimated download: ~{total_size}")
+            lines.append("")
         
         # Show nextflow command
-        print("Nextflow command that would be executed:")
-        print(f"  {' '.join(cmd)}")
-        print()
+        lines.append("Nextflow command that would be executed:")
+        lines.append(f"  {' '.join(cmd)}")
+        lines.append("")
+        
+        lines.append("NOTE: This is a dry-run. Use without --dry-run to execute.")
+        lines.append("      To automatically clean work directories after successful")
+        lines.append("      installation, add 'cleanup = true' to your nextflow.config")
         
-        print("NOTE: This is a dry-run. Use without --dry-run to execute.")
-        print("      To automatically clean work directories after successful")
-        print("      installation, add 'cleanup = true' to your nextflow.config")
+        # Emit the whole plan with a single write
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def show_available(self):
         """Show available tools and databases"""
+        from utils.install_validation import get_available_tools_summary
         print(get_available_tools_summary())
     
     def run(self, args) -> bool:
@@ -277,12 +269,12 @@ class InstallCommand:
                 )
                 return True  # Success
             else:
+                # Run from the phorager directory without changing our own cwd
                 phorager_dir = Path(sys.argv[0]).resolve().parent
-                os.chdir(phorager_dir)
                 
                 # Execute nextflow command
                 print("Executing installation...")
-                success = self._execute_nextflow(nextflow_cmd)
+                success = self._execute_nextflow(nextflow_cmd, phorager_dir)
                 return success
         
         except ValueError as e:
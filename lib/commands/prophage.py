@@ -5,18 +5,15 @@ Runs the prophage detection workflow using GenoMAD and VIBRANT.
 """
 
 import argparse
-import json
 import subprocess
 import sys
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
-from utils.prophage_validation import (
-    validate_and_detect_genome_input, validate_tool_selection,
-    validate_genomad_preset, validate_vibrant_min_length,
-    validate_databases
-)
-from utils.bacterial_validation import validate_threads, validate_output_directory
+from ._config_io import CONFIG_FILE, load_phorager_config
+from ._nextflow import nextflow_available, nextflow_common_args
+from ._output import output_suppressed
+from ._paths import paths_exist
 
 
 class ProphageCommand:
@@ -90,8 +87,6 @@ class ProphageCommand:
     
     def _load_config(self) -> Dict:
         """Load user configuration"""
-        config_file = Path.home() / '.phorager' / 'config.json'
-        
         # Default configuration
         default_config = {
             'backend': 'singularity',
@@ -99,21 +94,14 @@ class ProphageCommand:
             'cache_location': './cache'
         }
         
-        if not config_file.exists():
+        try:
+            # Merge with defaults - user config overrides, but defaults fill gaps
+            return load_phorager_config(CONFIG_FILE, default_config)
+        except FileNotFoundError:
             print("Warning: No configuration file found. Using defaults.")
             print("Run 'phorager config set' to configure backend and locations.")
             return default_config
-        
-        try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-            
-            # Merge with defaults - user config overrides, but defaults fill gaps
-            for key, value in default_config.items():
-                config.setdefault(key, value)
-            
-            return config
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             print(f"Error: Invalid configuration file: {e}")
             sys.exit(1)
     
@@ -124,66 +112,25 @@ class ProphageCommand:
         Returns:
             Tuple of (is_valid, input_mode, error_message, validated_genome_path)
         """
-        # Validate genome input and detect type
-        is_valid, input_mode, genome_path, error = validate_and_detect_genome_input(args.genome)
-        if not is_valid:
-            return (False, None, error, None)
-        
-        # Validate tool selection and parameter conflicts
-        is_valid, error = validate_tool_selection(
-            args.skip_genomad, args.skip_vibrant,
-            args.genomad_preset, args.vibrant_min_length
-        )
-        if not is_valid:
-            return (False, input_mode, error, None)
-        
-        # Validate GenoMAD preset if provided
-        if args.genomad_preset is not None:
-            is_valid, error = validate_genomad_preset(args.genomad_preset)
-            if not is_valid:
-                return (False, input_mode, error, None)
-        
-        # Validate VIBRANT min length if provided
-        if args.vibrant_min_length is not None:
-            is_valid, error = validate_vibrant_min_length(args.vibrant_min_length)
-            if not is_valid:
-                return (False, input_mode, error, None)
-        
-        # Validate threads if provided
-        if args.threads is not None:
-            try:
-                validated_threads = validate_threads(args.threads)
-            except ValueError as e:
-                return (False, input_mode, str(e), None)
-        
-        # Validate output directory
-        try:
-            validated_outdir = validate_output_directory(args.outdir)
-        except ValueError as e:
-            return (False, input_mode, str(e), None)
+        # Imported on use so other commands never load the prophage validators
+        from utils.prophage_validation import validate_all
         
-        # Validate database availability
-        is_valid, error = validate_databases(
+        is_valid, input_mode, genome_path, error = validate_all(
+            args.genome,
             self.config['db_location'],
             args.skip_genomad,
-            args.skip_vibrant
+            args.skip_vibrant,
+            args.genomad_preset,
+            args.vibrant_min_length,
+            threads=args.threads,
+            outdir=args.outdir
         )
-        if not is_valid:
-            return (False, input_mode, error, None)
-        
-        return (True, input_mode, None, genome_path)
+        return (is_valid, input_mode, error, genome_path)
     
     def _build_nextflow_command(self, args, input_mode: str) -> List[str]:
         """Build the nextflow command"""
-        cmd = ['nextflow', 'run', 'main.nf']
-        
-        # Add profile based on backend
-        if self.config['backend'] == 'conda':
-            cmd.extend(['-profile', 'conda'])
-        # singularity uses default profile
-        
-        # Add workflow specification
-        cmd.extend(['--workflow', 'prophage'])
+        # Backend profile and locations, then the prophage workflow
+        cmd = ['nextflow', 'run', 'main.nf', *nextflow_common_args(self.config), '--workflow', 'prophage']
         
         # Add genome input
         cmd.extend(['--genome', args.genome])
@@ -191,18 +138,6 @@ class ProphageCommand:
         # Add output directory
         cmd.extend(['--outdir', args.outdir])
         
-        # Add database location (only if configured)
-        if self.config.get('db_location'):
-            cmd.extend(['--database_location', self.config['db_location']])
-        
-        # Add cache location based on backend (only if configured)
-        cache_location = self.config.get('cache_location')
-        if cache_location:
-            if self.config['backend'] == 'conda':
-                cmd.extend(['--conda_cache_dir', cache_location])
-            else:
-                cmd.extend(['--singularity_cache_dir', cache_location])
-        
         # Add tool selection (only if skipping)
         if args.skip_genomad:
             cmd.extend(['--run_genomad', 'false'])
@@ -227,68 +162,76 @@ class ProphageCommand:
         
         return cmd
     
-    def _print_dry_run(self, args, input_mode: str, cmd: List[str]):
-        """Print dry-run information"""
-        print("=== Prophage Detection Dry Run ===\n")
+    def _print_dry_run(self, args, input_mode: str, cmd: List[str], genome_path: Path):
+        """Print dry-run information for the validated genome path"""
+        # Nothing to show when the output is discarded
+        if output_suppressed():
+            return
+        
+        lines = ["=== Prophage Detection Dry Run ===", ""]
         
         # Input configuration
-        print("Input Configuration:")
-        print(f"  Mode: {input_mode}")
-        print(f"  Path: {args.genome}")
+        lines.append("Input Configuration:")
+        lines.append(f"  Mode: {input_mode}")
+        lines.append(f"  Path: {args.genome}")
         
         if input_mode == 'bacterial_workflow':
-            genomes_path = Path(args.genome) / "1.Genome_preprocessing" / "Bact3_dRep" / "drep_output" / "dereplicated_genomes"
-            print(f"  Genomes: {genomes_path}")
-        print()
+            genomes_path = genome_path / "1.Genome_preprocessing" / "Bact3_dRep" / "drep_output" / "dereplicated_genomes"
+            lines.append(f"  Genomes: {genomes_path}")
+        lines.append("")
         
         # Tool configuration
-        print("Tool Configuration:")
+        lines.append("Tool Configuration:")
         
         genomad_status = "disabled" if args.skip_genomad else "enabled"
-        print(f"  GenoMAD: {genomad_status}")
+        lines.append(f"  GenoMAD: {genomad_status}")
         if not args.skip_genomad:
             preset = args.genomad_preset if args.genomad_preset else "default (Nextflow default)"
-            print(f"    Preset: {preset}")
+            lines.append(f"    Preset: {preset}")
         
         vibrant_status = "disabled" if args.skip_vibrant else "enabled"
-        print(f"  VIBRANT: {vibrant_status}")
+        lines.append(f"  VIBRANT: {vibrant_status}")
         if not args.skip_vibrant:
             min_len = f"{args.vibrant_min_length} bp" if args.vibrant_min_length else "1000 bp (Nextflow default)"
-            print(f"    Min Length: {min_len}")
-        print()
+            lines.append(f"    Min Length: {min_len}")
+        lines.append("")
         
         # Database configuration
-        print("Database Configuration:")
-        print(f"  Location: {self.config['db_location']}")
+        lines.append("Database Configuration:")
+        lines.append(f"  Location: {self.config['db_location']}")
         
+        db_root = Path(self.config['db_location'])
+        db_checks = []
         if not args.skip_genomad:
-            genomad_db = Path(self.config['db_location']) / "genomad_database"
-            status = "✓" if genomad_db.exists() else "✗"
-            print(f"  GenoMAD DB: {genomad_db} {status}")
-        
+            db_checks.append(("GenoMAD DB", db_root / "genomad_database"))
         if not args.skip_vibrant:
-            vibrant_db = Path(self.config['db_location']) / "vibrant_database"
-            status = "✓" if vibrant_db.exists() else "✗"
-            print(f"  VIBRANT DB: {vibrant_db} {status}")
-        print()
+            db_checks.append(("VIBRANT DB", db_root / "vibrant_database"))
+        
+        for (label, db_path), exists in zip(db_checks, paths_exist(db_path for _, db_path in db_checks)):
+            status = "✓" if exists else "✗"
+            lines.append(f"  {label}: {db_path} {status}")
+        lines.append("")
         
         # Output configuration
-        print("Output Configuration:")
-        print(f"  Directory: {args.outdir}")
+        lines.append("Output Configuration:")
+        lines.append(f"  Directory: {args.outdir}")
         threads = f"{args.threads}" if args.threads else "auto-detect (Nextflow default)"
-        print(f"  Threads: {threads}")
-        print()
+        lines.append(f"  Threads: {threads}")
+        lines.append("")
         
         # Nextflow command
-        print("Nextflow Command:")
-        print(f"  {' '.join(cmd)}")
-        print()
+        lines.append("Nextflow Command:")
+        lines.append(f"  {' '.join(cmd)}")
+        lines.append("")
         
         # Notes
-        print("Notes:")
+        lines.append("Notes:")
         resume_status = "enabled" if args.resume else "not enabled (add --resume to resume previous run)"
-        print(f"  - Resume: {resume_status}")
-        print(f"  - Cleanup: check nextflow.config (cleanup disables resume)")
+        lines.append(f"  - Resume: {resume_status}")
+        lines.append("  - Cleanup: check nextflow.config (cleanup disables resume)")
+        
+        # Emit the whole dry run with a single write
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def run(self, args) -> bool:
         """Execute the prophage command"""
@@ -308,27 +251,23 @@ class ProphageCommand:
             
             # Handle dry-run
             if args.dry_run:
-                self._print_dry_run(args, input_mode, cmd)
+                self._print_dry_run(args, input_mode, cmd, genome_path)
                 return True
             
-            # Check if nextflow is available
-            try:
-                subprocess.run(['nextflow', '-version'], 
-                             capture_output=True, check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
+            # Check if nextflow is available (cached between runs)
+            if not nextflow_available():
                 print("Error: Nextflow is not installed or not in PATH")
                 print("Please install Nextflow: https://www.nextflow.io/docs/latest/getstarted.html")
                 return False
             
-            # Change to phorager directory before running nextflow
+            # Run nextflow from the phorager directory without changing our own cwd
             phorager_dir = Path(sys.argv[0]).resolve().parent
-            os.chdir(phorager_dir)
 
             # Execute command
             print(f"Running prophage detection workflow...")
             print(f"Command: {' '.join(cmd)}\n")
             
-            result = subprocess.run(cmd)
+            result = subprocess.run(cmd, cwd=phorager_dir)
             
             if result.returncode == 0:
                 print("\nProphage detection workflow completed successfully!")
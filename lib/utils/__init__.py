@@ -3,42 +3,56 @@ Phorager Utilities Module
 
 Contains shared utilities and helper functions used across commands.
 Includes validation, logging, and common operations.
+
+Validation helpers are imported lazily on first attribute access, so using
+one command's validators does not import those of all the others.
 """
 
-from .install_validation import (
-    validate_tools_list, validate_databases_list,
-    get_available_tools_summary, ALL_TOOLS, DATABASE_TOOLS
-)
-from .bacterial_validation import (
-    validate_genome_input, 
-    validate_percentage_threshold,
-    validate_ani_threshold,
-    validate_threads, 
-    validate_output_directory
-)
-from .prophage_validation import (
-    validate_and_detect_genome_input, validate_tool_selection,
-    validate_genomad_preset, validate_vibrant_min_length,
-    validate_databases
-)
+import importlib
 
-from .annotation_validation import (
-    validate_and_detect_prophage_input,
-    validate_checkv_quality_levels,
-    validate_annotation_parameters,
-    validate_filter_mode,
-    validate_min_prophage_length,
-    validate_structural_thresholds,
-    validate_clustering_parameters,
-    validate_databases as validate_annotation_databases,
-    VALID_CHECKV_QUALITY_LEVELS,
-    VALID_FILTER_MODES
-)
+# Map exported names to (submodule, attribute) so each validation module is
+# only imported when one of its names is first used
+_EXPORTS = {
+    # Install validation
+    'validate_tools_list': ('.install_validation', 'validate_tools_list'),
+    'validate_databases_list': ('.install_validation', 'validate_databases_list'),
+    'parse_and_validate_tools': ('.install_validation', 'parse_and_validate_tools'),
+    'parse_and_validate_databases': ('.install_validation', 'parse_and_validate_databases'),
+    'get_available_tools_summary': ('.install_validation', 'get_available_tools_summary'),
+    'ALL_TOOLS': ('.install_validation', 'ALL_TOOLS'),
+    'DATABASE_TOOLS': ('.install_validation', 'DATABASE_TOOLS'),
+    # Bacterial validation
+    'validate_genome_input': ('.bacterial_validation', 'validate_genome_input'),
+    'validate_percentage_threshold': ('.bacterial_validation', 'validate_percentage_threshold'),
+    'validate_ani_threshold': ('.bacterial_validation', 'validate_ani_threshold'),
+    'validate_threads': ('.bacterial_validation', 'validate_threads'),
+    'validate_output_directory': ('.bacterial_validation', 'validate_output_directory'),
+    # Prophage validation
+    'validate_and_detect_genome_input': ('.prophage_validation', 'validate_and_detect_genome_input'),
+    'validate_tool_selection': ('.prophage_validation', 'validate_tool_selection'),
+    'validate_genomad_preset': ('.prophage_validation', 'validate_genomad_preset'),
+    'validate_vibrant_min_length': ('.prophage_validation', 'validate_vibrant_min_length'),
+    'validate_databases': ('.prophage_validation', 'validate_databases'),
+    'validate_prophage_inputs': ('.prophage_validation', 'validate_all'),
+    # Annotation validation
+    'validate_and_detect_prophage_input': ('.annotation_validation', 'validate_and_detect_prophage_input'),
+    'validate_checkv_quality_levels': ('.annotation_validation', 'validate_checkv_quality_levels'),
+    'validate_annotation_parameters': ('.annotation_validation', 'validate_annotation_parameters'),
+    'validate_filter_mode': ('.annotation_validation', 'validate_filter_mode'),
+    'validate_min_prophage_length': ('.annotation_validation', 'validate_min_prophage_length'),
+    'validate_structural_thresholds': ('.annotation_validation', 'validate_structural_thresholds'),
+    'validate_clustering_parameters': ('.annotation_validation', 'validate_clustering_parameters'),
+    'validate_annotation_databases': ('.annotation_validation', 'validate_databases'),
+    'VALID_CHECKV_QUALITY_LEVELS': ('.annotation_validation', 'VALID_CHECKV_QUALITY_LEVELS'),
+    'VALID_FILTER_MODES': ('.annotation_validation', 'VALID_FILTER_MODES')
+}
 
 __all__ = [
     # Install validation
     'validate_tools_list',
     'validate_databases_list', 
+    'parse_and_validate_tools',
+    'parse_and_validate_databases',
     'get_available_tools_summary',
     'ALL_TOOLS',
     'DATABASE_TOOLS',
@@ -53,7 +67,8 @@ __all__ = [
     'validate_tool_selection',
     'validate_genomad_preset',
     'validate_vibrant_min_length',
-    'validate_databases'
+    'validate_databases',
+    'validate_prophage_inputs',
     # Annotation validation
     'validate_and_detect_prophage_input',
     'validate_checkv_quality_levels',
@@ -65,4 +80,20 @@ __all__ = [
     'validate_annotation_databases',
     'VALID_CHECKV_QUALITY_LEVELS',
     'VALID_FILTER_MODES'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Import validation helpers on first access (PEP 562)"""
+    try:
+        module_name, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
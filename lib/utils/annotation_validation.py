@@ -4,8 +4,9 @@ Annotation Validation Utilities
 Validation functions for the annotation workflow command.
 """
 
-from pathlib import Path
-from typing import List, Tuple, Optional
+import os
+import stat
+from typing import FrozenSet, List, Tuple, Optional, Union
 
 
 # Valid CheckV quality levels
@@ -17,9 +18,64 @@ VALID_CHECKV_QUALITY_LEVELS = [
     'Not-determined'
 ]
 
+# FASTA file name extensions accepted as prophage input
+FASTA_EXTENSIONS = ('.fa', '.fasta', '.fna')
+
 # Valid filter modes
 VALID_FILTER_MODES = ['pharokka', 'phold', 'combined']
 
+# Database directory naming convention
+DB_DIR_MAPPING = {
+    'checkv': 'checkv_database',
+    'pharokka': 'pharokka_database',
+    'phold': 'phold_database'
+}
+
+# Structural filtering parameters as (attribute, default, option), in the
+# order they are reported
+_PHAROKKA_STRUCTURAL_DEFAULTS = (
+    ('pharokka_structural_perc', 10.0, '--pharokka-structural-perc'),
+    ('pharokka_structural_total', 3, '--pharokka-structural-total')
+)
+_PHOLD_STRUCTURAL_DEFAULTS = (
+    ('phold_structural_perc', 10.0, '--phold-structural-perc'),
+    ('phold_structural_total', 3, '--phold-structural-total')
+)
+_STRUCTURAL_DEFAULTS = _PHAROKKA_STRUCTURAL_DEFAULTS + _PHOLD_STRUCTURAL_DEFAULTS
+
+# Hashed views for membership tests; the lists above keep the order used in
+# error messages
+VALID_CHECKV_QUALITY_LEVELS_SET = frozenset(VALID_CHECKV_QUALITY_LEVELS)
+VALID_FILTER_MODES_SET = frozenset(VALID_FILTER_MODES)
+
+# Joined lists for error messages, built once
+_VALID_LEVELS_JOINED = ', '.join(VALID_CHECKV_QUALITY_LEVELS)
+_VALID_MODES_JOINED = ', '.join(VALID_FILTER_MODES)
+_VALID_EXTS_JOINED = ', '.join(FASTA_EXTENSIONS)
+
+
+def _changed_options(args, defaults) -> List[str]:
+    """Return the options whose values differ from their defaults"""
+    return [option for attr, default, option in defaults if getattr(args, attr) != default]
+
+
+def _normalize_path(path: str) -> str:
+    """
+    Normalize a path as pathlib does, without importing it
+    
+    Empty and '.' components and trailing slashes are dropped, but '..' is
+    kept: collapsing it lexically can point elsewhere than the filesystem
+    would when the preceding component is a symlink.
+    """
+    if path.startswith('//') and not path.startswith('///'):
+        root = '//'
+    elif path.startswith('/'):
+        root = '/'
+    else:
+        root = ''
+    parts = [part for part in path.split('/') if part and part != '.']
+    return root + '/'.join(parts) or '.'
+
 
 def validate_and_detect_prophage_input(prophage_path: str) -> Tuple[bool, Optional[str], Optional[str], Optional[str]]:
     """
@@ -32,63 +88,88 @@ def validate_and_detect_prophage_input(prophage_path: str) -> Tuple[bool, Option
         Tuple of (is_valid, input_mode, resolved_path, error_message)
         input_mode can be: 'single_file', 'prophage_workflow', 'direct_subdir'
     """
-    input_path = Path(prophage_path)
+    # Returned paths are reported in normalized form
+    input_path = _normalize_path(prophage_path)
     
-    # Check if path exists
-    if not input_path.exists():
+    # Check if path exists; one stat answers the file/directory checks too
+    try:
+        input_stat = os.stat(prophage_path)
+    except (OSError, ValueError):
         return False, None, None, f"Input path does not exist: {prophage_path}"
     
     # Mode 1: Single FASTA file
-    if input_path.is_file():
+    if stat.S_ISREG(input_stat.st_mode):
         # Validate file extension
-        valid_extensions = {'.fa', '.fasta', '.fna'}
-        if input_path.suffix.lower() not in valid_extensions:
+        suffix = os.path.splitext(input_path)[1]
+        if suffix.lower() not in FASTA_EXTENSIONS:
             return False, None, None, (
-                f"Invalid file extension '{input_path.suffix}'. "
-                f"Expected one of: {', '.join(valid_extensions)}"
+                f"Invalid file extension '{suffix}'. "
+                f"Expected one of: {_VALID_EXTS_JOINED}"
             )
         
         # Check if file is not empty
-        if input_path.stat().st_size == 0:
+        if input_stat.st_size == 0:
             return False, None, None, f"Input file is empty: {prophage_path}"
         
-        return True, 'single_file', str(input_path), None
+        return True, 'single_file', input_path, None
     
     # Mode 2 & 3: Directory input
-    elif input_path.is_dir():
-        # Check for prophage workflow output structure
-        prophage_output = input_path / '2.Prophage_detection' / 'All_prophage_sequences.fasta'
+    elif stat.S_ISDIR(input_stat.st_mode):
+        # One directory listing answers every check below: which of the
+        # known workflow entries are present, and how many FASTA files
+        has_prophage_subdir = False
+        direct_entry = None
+        fasta_count = 0
+        first_fasta = None
+        with os.scandir(input_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name == '2.Prophage_detection':
+                    has_prophage_subdir = True
+                elif name == 'All_prophage_sequences.fasta':
+                    direct_entry = entry
+                if name.endswith(FASTA_EXTENSIONS):
+                    fasta_count += 1
+                    if first_fasta is None:
+                        first_fasta = entry
         
-        if prophage_output.exists():
-            # Mode 2: Prophage workflow results
-            if prophage_output.stat().st_size == 0:
-                return False, None, None, f"Prophage sequences file is empty: {prophage_output}"
-            return True, 'prophage_workflow', str(input_path), None
+        # Check for prophage workflow output structure
+        if has_prophage_subdir:
+            prophage_output = os.path.join(input_path, '2.Prophage_detection', 'All_prophage_sequences.fasta')
+            try:
+                output_size = os.stat(prophage_output).st_size
+            except OSError:
+                output_size = None
+            if output_size is not None:
+                # Mode 2: Prophage workflow results
+                if output_size == 0:
+                    return False, None, None, f"Prophage sequences file is empty: {prophage_output}"
+                return True, 'prophage_workflow', input_path, None
         
         # Check for direct subdirectory with All_prophage_sequences.fasta
-        direct_fasta = input_path / 'All_prophage_sequences.fasta'
-        if direct_fasta.exists():
-            # Mode 3: Direct subdirectory
-            if direct_fasta.stat().st_size == 0:
-                return False, None, None, f"Prophage sequences file is empty: {direct_fasta}"
-            return True, 'direct_subdir', str(input_path), None
+        if direct_entry is not None:
+            try:
+                direct_size = direct_entry.stat().st_size
+            except OSError:
+                direct_size = None
+            if direct_size is not None:
+                # Mode 3: Direct subdirectory
+                if direct_size == 0:
+                    return False, None, None, f"Prophage sequences file is empty: {direct_entry.path}"
+                return True, 'direct_subdir', input_path, None
         
         # Check if directory contains multiple FASTA files (ERROR case)
-        fasta_files = list(input_path.glob('*.fa')) + \
-                     list(input_path.glob('*.fasta')) + \
-                     list(input_path.glob('*.fna'))
-        
-        if len(fasta_files) > 1:
+        if fasta_count > 1:
             return False, None, None, (
-                f"Directory contains multiple FASTA files ({len(fasta_files)} files found). "
+                f"Directory contains multiple FASTA files ({fasta_count} files found). "
                 "Annotation workflow requires a single merged prophage file. "
                 "Please use the prophage workflow output or merge sequences into a single file."
             )
-        elif len(fasta_files) == 1:
+        elif fasta_count == 1:
             # Single FASTA file in directory - treat as single file mode
-            if fasta_files[0].stat().st_size == 0:
-                return False, None, None, f"Input file is empty: {fasta_files[0]}"
-            return True, 'single_file', str(fasta_files[0]), None
+            if first_fasta.stat().st_size == 0:
+                return False, None, None, f"Input file is empty: {first_fasta.path}"
+            return True, 'single_file', first_fasta.path, None
         
         # No valid input found
         return False, None, None, (
@@ -101,35 +182,36 @@ def validate_and_detect_prophage_input(prophage_path: str) -> Tuple[bool, Option
     return False, None, None, f"Invalid input type: {prophage_path}"
 
 
-def validate_checkv_quality_levels(levels_str: str) -> Tuple[Optional[List[str]], Optional[str]]:
+def validate_checkv_quality_levels(levels_input: Union[str, List[str]]) -> Tuple[Optional[List[str]], Optional[str]]:
     """
     Validate CheckV quality levels
     
     Args:
-        levels_str: Comma-separated string of quality levels
+        levels_input: Comma-separated string of quality levels, or a list of
+            quality levels already split by the argument parser
     
     Returns:
         Tuple of (valid_levels_list, error_message)
     """
-    if not levels_str or not levels_str.strip():
-        return None, "CheckV quality levels cannot be empty"
-    
-    # Parse comma-separated list
-    levels = [level.strip() for level in levels_str.split(',') if level.strip()]
+    if isinstance(levels_input, str):
+        if not levels_input.strip():
+            return None, "CheckV quality levels cannot be empty"
+        
+        # Parse comma-separated list
+        levels = [level for level in map(str.strip, levels_input.split(',')) if level]
+    else:
+        levels = [level for level in levels_input if level]
     
     if not levels:
         return None, "No valid quality levels found in input"
     
-    # Validate each level
-    invalid_levels = []
-    for level in levels:
-        if level not in VALID_CHECKV_QUALITY_LEVELS:
-            invalid_levels.append(level)
-    
-    if invalid_levels:
+    # Validate all levels with one set containment check; the ordered list of
+    # offending entries is only built for the error message
+    if not VALID_CHECKV_QUALITY_LEVELS_SET.issuperset(levels):
+        invalid_levels = [level for level in levels if level not in VALID_CHECKV_QUALITY_LEVELS_SET]
         return None, (
             f"Invalid CheckV quality level(s): {', '.join(invalid_levels)}. "
-            f"Valid levels are: {', '.join(VALID_CHECKV_QUALITY_LEVELS)}"
+            f"Valid levels are: {_VALID_LEVELS_JOINED}"
         )
     
     return levels, None
@@ -145,10 +227,13 @@ def validate_annotation_parameters(args) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
+    # Each option is read from the namespace once
+    filter_mode = getattr(args, 'annotation_filter_mode', 'combined')
+    
     # Check if skip flag conflicts with structural filtering parameters
     if args.skip_detailed_annotation:
         # Check for annotation filter mode
-        if hasattr(args, 'annotation_filter_mode') and args.annotation_filter_mode != 'combined':
+        if filter_mode != 'combined':
             # User explicitly changed filter mode
             return False, (
                 "Cannot specify --annotation-filter-mode when using --skip-detailed-annotation. "
@@ -157,16 +242,7 @@ def validate_annotation_parameters(args) -> Tuple[bool, Optional[str]]:
             )
         
         # Check for any structural parameter changes from defaults
-        structural_params_changed = []
-        
-        if args.pharokka_structural_perc != 10.0:
-            structural_params_changed.append('--pharokka-structural-perc')
-        if args.pharokka_structural_total != 3:
-            structural_params_changed.append('--pharokka-structural-total')
-        if args.phold_structural_perc != 10.0:
-            structural_params_changed.append('--phold-structural-perc')
-        if args.phold_structural_total != 3:
-            structural_params_changed.append('--phold-structural-total')
+        structural_params_changed = _changed_options(args, _STRUCTURAL_DEFAULTS)
         
         if structural_params_changed:
             return False, (
@@ -175,19 +251,19 @@ def validate_annotation_parameters(args) -> Tuple[bool, Optional[str]]:
                 f"Remove --skip-detailed-annotation or remove structural parameters."
             )
     
-    # Check filter mode conflicts with tool parameters (only if NOT skipping)
-    if not args.skip_detailed_annotation:
-        if args.annotation_filter_mode == 'pharokka':
+    else:
+        # Check filter mode conflicts with tool parameters (only if NOT skipping)
+        if filter_mode == 'pharokka':
             # Check for PHOLD parameter changes
-            if args.phold_structural_perc != 10.0 or args.phold_structural_total != 3:
+            if _changed_options(args, _PHOLD_STRUCTURAL_DEFAULTS):
                 return False, (
                     "Cannot specify PHOLD structural parameters when filter mode is 'pharokka'. "
                     "Change filter mode to 'phold' or 'combined', or remove PHOLD parameters."
                 )
         
-        elif args.annotation_filter_mode == 'phold':
+        elif filter_mode == 'phold':
             # Check for Pharokka parameter changes
-            if args.pharokka_structural_perc != 10.0 or args.pharokka_structural_total != 3:
+            if _changed_options(args, _PHAROKKA_STRUCTURAL_DEFAULTS):
                 return False, (
                     "Cannot specify Pharokka structural parameters when filter mode is 'phold'. "
                     "Change filter mode to 'pharokka' or 'combined', or remove Pharokka parameters."
@@ -206,10 +282,10 @@ def validate_filter_mode(mode: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if mode not in VALID_FILTER_MODES:
+    if mode not in VALID_FILTER_MODES_SET:
         return False, (
             f"Invalid filter mode: '{mode}'. "
-            f"Valid modes are: {', '.join(VALID_FILTER_MODES)}"
+            f"Valid modes are: {_VALID_MODES_JOINED}"
         )
     
     return True, None
@@ -225,10 +301,9 @@ def validate_min_prophage_length(length: int) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if length < 500:
-        return False, f"Minimum prophage length must be at least 500 bp (got: {length})"
-    
-    if length > 50000:
+    if not 500 <= length <= 50000:
+        if length < 500:
+            return False, f"Minimum prophage length must be at least 500 bp (got: {length})"
         return False, f"Minimum prophage length cannot exceed 50000 bp (got: {length})"
     
     return True, None
@@ -247,20 +322,19 @@ def validate_structural_thresholds(perc: float, total: int, tool_name: str) -> T
         Tuple of (is_valid, error_message)
     """
     # Validate percentage
-    if perc < 0 or perc > 100:
+    if not 0 <= perc <= 100:
         return False, (
             f"{tool_name} structural percentage must be between 0 and 100 "
             f"(got: {perc})"
         )
     
     # Validate total count
-    if total < 1:
-        return False, (
-            f"{tool_name} structural total must be at least 1 "
-            f"(got: {total})"
-        )
-    
-    if total > 20:
+    if not 1 <= total <= 20:
+        if total < 1:
+            return False, (
+                f"{tool_name} structural total must be at least 1 "
+                f"(got: {total})"
+            )
         return False, (
             f"{tool_name} structural total cannot exceed 20 "
             f"(got: {total})"
@@ -281,55 +355,54 @@ def validate_clustering_parameters(ani: float, coverage: float) -> Tuple[bool, O
         Tuple of (is_valid, error_message)
     """
     # Validate ANI
-    if ani < 0 or ani > 100:
+    if not 0 <= ani <= 100:
         return False, f"Clustering ANI must be between 0 and 100 (got: {ani})"
     
     # Validate coverage
-    if coverage < 0 or coverage > 100:
+    if not 0 <= coverage <= 100:
         return False, f"Clustering coverage must be between 0 and 100 (got: {coverage})"
     
     return True, None
 
 
-def validate_databases(required_databases: List[str], db_location: str) -> Tuple[bool, Optional[List[str]], Optional[str]]:
+def validate_databases(required_databases: List[str], db_location: str,
+                       existing_entries: Optional[FrozenSet[str]] = None) -> Tuple[bool, Optional[List[str]], Optional[str]]:
     """
     Validate that required databases exist
     
     Args:
         required_databases: List of required database names
         db_location: Base database directory path
+        existing_entries: Optional snapshot of the names of the directories
+            in db_location; when given, database directories are looked up
+            in it instead of being checked individually on disk
     
     Returns:
         Tuple of (is_valid, missing_databases, error_message)
     """
-    db_path = Path(db_location)
-    
-    if not db_path.exists():
+    if existing_entries is None and not os.path.isdir(db_location):
         return False, required_databases, (
             f"Database location does not exist: {db_location}\n"
             f"Run 'phorager config set --db-location /path/to/databases' to set the location."
         )
     
-    # Database directory naming convention
-    db_dir_mapping = {
-        'checkv': 'checkv_database',
-        'pharokka': 'pharokka_database',
-        'phold': 'phold_database'
-    }
-    
-    missing_databases = []
-    
     for db in required_databases:
-        if db not in db_dir_mapping:
+        if db not in DB_DIR_MAPPING:
             return False, [db], f"Unknown database: {db}"
-        
-        db_dir = db_path / db_dir_mapping[db]
-        if not db_dir.exists():
-            missing_databases.append(db)
+    
+    if existing_entries is not None:
+        missing_databases = [
+            db for db in required_databases if DB_DIR_MAPPING[db] not in existing_entries
+        ]
+    else:
+        missing_databases = [
+            db for db in required_databases
+            if not os.path.isdir(os.path.join(db_location, DB_DIR_MAPPING[db]))
+        ]
     
     if missing_databases:
         return False, missing_databases, (
             f"Required database(s) not found in {db_location}"
         )
     
-    return True, [], None
\ No newline at end of file
+    return True, [], None
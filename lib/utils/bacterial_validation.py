@@ -5,12 +5,31 @@ Provides validation functions for bacterial genome quality control workflow.
 Adapted from original wrapper validation logic with modular architecture.
 """
 
+import functools
 import os
-import multiprocessing
+import stat
 from pathlib import Path
 from typing import Dict
 
 
+# FASTA file name extensions accepted as genome input
+GENOME_EXTENSIONS = ('.fa', '.fasta', '.fna')
+_GENOME_EXTENSIONS_JOINED = ', '.join(GENOME_EXTENSIONS)
+
+
+def _canonicalize(path: str) -> str:
+    """Expand ~ and make the path absolute, against the current directory"""
+    return os.path.abspath(os.path.expanduser(path))
+
+
+@functools.lru_cache(maxsize=None)
+def cpu_count() -> int:
+    """Number of CPUs, probed once per process"""
+    # Imported here: multiprocessing is slow to import and rarely needed
+    import multiprocessing
+    return multiprocessing.cpu_count()
+
+
 def validate_genome_input(genome_path: str) -> str:
     """
     Validate genome input (file or directory)
@@ -28,30 +47,28 @@ def validate_genome_input(genome_path: str) -> str:
         raise ValueError("Genome path cannot be empty")
     
     # Convert to absolute path
-    genome_path = os.path.abspath(os.path.expanduser(genome_path))
+    genome_path = _canonicalize(genome_path)
     
-    if not os.path.exists(genome_path):
+    # One stat answers the existence, file and directory checks
+    try:
+        mode = os.stat(genome_path).st_mode
+    except (OSError, ValueError):
         raise ValueError(f"Genome path does not exist: {genome_path}")
     
-    if os.path.isfile(genome_path):
+    if stat.S_ISREG(mode):
         # Validate file extension
-        valid_extensions = ['.fa', '.fasta', '.fna']
-        if not any(genome_path.endswith(ext) for ext in valid_extensions):
+        if not genome_path.endswith(GENOME_EXTENSIONS):
             raise ValueError(
-                f"Invalid genome file extension. Must end with {', '.join(valid_extensions)}: {genome_path}"
+                f"Invalid genome file extension. Must end with {_GENOME_EXTENSIONS_JOINED}: {genome_path}"
             )
         return genome_path
     
-    elif os.path.isdir(genome_path):
-        # Check directory contains valid genome files
-        genome_files = []
-        for ext in ['.fa', '.fasta', '.fna']:
-            genome_files.extend([
-                f for f in os.listdir(genome_path) 
-                if f.endswith(ext)
-            ])
+    elif stat.S_ISDIR(mode):
+        # Check directory contains valid genome files (stop at the first)
+        with os.scandir(genome_path) as entries:
+            found = any(entry.name.endswith(GENOME_EXTENSIONS) for entry in entries)
         
-        if not genome_files:
+        if not found:
             raise ValueError(
                 f"No genome files found in directory. Files must end with .fa, .fasta, or .fna: {genome_path}"
             )
@@ -80,10 +97,15 @@ def validate_threads(threads) -> int:
         
         if threads < 1:
             raise ValueError("Thread count must be a positive integer")
-        
-        return threads
     except (ValueError, TypeError):
         raise ValueError(f"Invalid thread count: {threads}. Must be a positive integer.")
+    
+    # Allowed, but far more threads than CPUs usually slows the workflow down
+    available = cpu_count()
+    if threads > available * 4:
+        print(f"Warning: {threads} threads requested but only {available} CPUs are available")
+    
+    return threads
 
 
 def validate_percentage_threshold(value, name: str) -> float:
@@ -102,7 +124,7 @@ def validate_percentage_threshold(value, name: str) -> float:
     """
     try:
         float_value = float(value)
-        if float_value < 0 or float_value > 100:
+        if not 0 <= float_value <= 100:
             raise ValueError(f"{name} must be between 0 and 100, got {float_value}")
         return float_value
     except (ValueError, TypeError):
@@ -124,7 +146,7 @@ def validate_ani_threshold(value) -> float:
     """
     try:
         float_value = float(value)
-        if float_value < 0 or float_value > 1:
+        if not 0 <= float_value <= 1:
             raise ValueError(f"dRep ANI threshold must be between 0 and 1, got {float_value}")
         return float_value
     except (ValueError, TypeError):
@@ -178,7 +200,7 @@ def validate_output_directory(outdir: str) -> str:
         raise ValueError("Output directory cannot be empty")
     
     # Convert to absolute path
-    outdir = os.path.abspath(os.path.expanduser(outdir))
+    outdir = _canonicalize(outdir)
     
     if not os.path.exists(outdir):
         try:
@@ -186,8 +208,10 @@ def validate_output_directory(outdir: str) -> str:
             print(f"Created output directory: {outdir}")
         except Exception as e:
             raise ValueError(f"Could not create output directory: {outdir}. Error: {e}")
-    else:
-        print(f"Warning: Using existing output directory: {outdir}")
+        # Newly created by us, so no need to check it is writable
+        return outdir
+    
+    print(f"Warning: Using existing output directory: {outdir}")
     
     # Verify directory is writable
     if not os.access(outdir, os.W_OK):
@@ -213,12 +237,14 @@ def validate_database_location(db_location: str) -> str:
         raise ValueError("Database location cannot be empty")
     
     # Convert to absolute path
-    db_location = os.path.abspath(os.path.expanduser(db_location))
+    db_location = _canonicalize(db_location)
     
-    if not os.path.exists(db_location):
+    try:
+        mode = os.stat(db_location).st_mode
+    except (OSError, ValueError):
         raise ValueError(f"Database location does not exist: {db_location}")
     
-    if not os.path.isdir(db_location):
+    if not stat.S_ISDIR(mode):
         raise ValueError(f"Database location is not a directory: {db_location}")
     
     return db_location
@@ -242,12 +268,14 @@ def validate_directory_path(path: str, name: str) -> str:
         raise ValueError(f"{name} cannot be empty")
     
     # Convert to absolute path
-    path = os.path.abspath(os.path.expanduser(path))
+    path = _canonicalize(path)
     
-    if not os.path.exists(path):
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
         raise ValueError(f"{name} does not exist: {path}")
     
-    if not os.path.isdir(path):
+    if not stat.S_ISDIR(mode):
         raise ValueError(f"{name} is not a directory: {path}")
     
     return path
\ No newline at end of file
@@ -5,7 +5,8 @@ Provides tool registry constants and validation functions.
 Supports bacterial genome, prophage detection, and annotation tools.
 """
 
-from typing import List, Set, Dict
+import functools
+from typing import Dict, FrozenSet, Iterator, List, Set, Tuple
 
 
 # Tool Groups - organized by workflow
@@ -37,6 +38,11 @@ DATABASE_TOOLS: List[str] = [
     'phold'
 ]
 
+# Hashed views of the registries for membership tests; the lists above keep
+# the display and expansion order
+ALL_TOOLS_SET: FrozenSet[str] = frozenset(ALL_TOOLS)
+DATABASE_TOOLS_SET: FrozenSet[str] = frozenset(DATABASE_TOOLS)
+
 # Tool descriptions (from tools_registry.yaml)
 TOOL_DESCRIPTIONS: Dict[str, str] = {
     'checkm2': 'Genome quality',
@@ -59,6 +65,11 @@ DATABASE_SIZES: Dict[str, str] = {
     'phold': '15.0GB'
 }
 
+# Database sizes as numbers of GB (e.g., "2.9GB" -> 2.9) for size totals
+DATABASE_SIZES_GB: Dict[str, float] = {
+    db: float(size.replace('GB', '')) for db, size in DATABASE_SIZES.items()
+}
+
 # Valid backend options
 VALID_BACKENDS: List[str] = ['conda', 'singularity']
 
@@ -73,7 +84,7 @@ def is_valid_tool(tool_name: str) -> bool:
     Returns:
         True if tool is valid, False otherwise
     """
-    return tool_name in ALL_TOOLS
+    return tool_name in ALL_TOOLS_SET
 
 
 def is_valid_database(database_name: str) -> bool:
@@ -86,7 +97,7 @@ def is_valid_database(database_name: str) -> bool:
     Returns:
         True if database is valid, False otherwise
     """
-    return database_name in DATABASE_TOOLS
+    return database_name in DATABASE_TOOLS_SET
 
 
 def is_valid_tool_group(group_name: str) -> bool:
@@ -120,31 +131,25 @@ def expand_tool_groups(tools: List[str]) -> List[str]:
         -> ['checkm2', 'drep', 'parsing_env', 'genomad', 'vibrant']
         (parsing_env appears only once)
     """
+    return list(_expand_tool_groups(tuple(tools)))
+
+
+@functools.lru_cache(maxsize=None)
+def _expand_tool_groups(tools: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Expand and deduplicate a tool selection (cached per selection)"""
     expanded = []
     
     for item in tools:
         if item == 'all':
             # Special case: 'all' expands to all available tools
             expanded.extend(ALL_TOOLS)
-        elif is_valid_tool_group(item):
-            # Expand group to individual tools
-            expanded.extend(TOOL_GROUPS[item])
-        elif is_valid_tool(item):
-            # Individual tool
-            expanded.append(item)
         else:
-            # Invalid tool/group - let calling code handle this
-            expanded.append(item)
+            # Groups expand to their tools; individual tools and invalid
+            # names (left for the calling code to report) are kept as is
+            expanded.extend(TOOL_GROUPS.get(item, (item,)))
     
     # Remove duplicates while preserving order
-    seen = set()
-    result = []
-    for tool in expanded:
-        if tool not in seen:
-            seen.add(tool)
-            result.append(tool)
-    
-    return result
+    return tuple(dict.fromkeys(expanded))
 
 
 def expand_database_list(databases: List[str]) -> List[str]:
@@ -177,13 +182,17 @@ def calculate_total_database_size(databases: List[str]) -> str:
     Returns:
         Formatted string with total size (e.g., "18.8GB")
     """
+    return _total_database_size(tuple(databases))
+
+
+@functools.lru_cache(maxsize=None)
+def _total_database_size(databases: Tuple[str, ...]) -> str:
+    """Sum and format the database sizes (cached per selection)"""
     total_gb = 0.0
     
     for db in databases:
-        if db in DATABASE_SIZES:
-            size_str = DATABASE_SIZES[db]
-            # Extract numeric value (e.g., "2.9GB" -> 2.9)
-            size_value = float(size_str.replace('GB', ''))
+        size_value = DATABASE_SIZES_GB.get(db)
+        if size_value is not None:
             total_gb += size_value
     
     return f"{total_gb:.1f}GB"
@@ -201,13 +210,15 @@ def validate_tools_list(tools: List[str]) -> tuple[List[str], List[str]]:
         valid_tools: List of valid individual tool names (deduplicated)
         invalid_items: List of invalid tool/group names
     """
-    expanded_tools = expand_tool_groups(tools)
+    # Fast path: only 'all' was requested, so every tool is valid
+    if tools and all(item == 'all' for item in tools):
+        return list(ALL_TOOLS), []
     
     valid_tools = []
     invalid_items = []
     
-    for tool in expanded_tools:
-        if is_valid_tool(tool):
+    for tool in expand_tool_groups(tools):
+        if tool in ALL_TOOLS_SET:
             valid_tools.append(tool)
         else:
             invalid_items.append(tool)
@@ -225,13 +236,75 @@ def validate_databases_list(databases: List[str]) -> tuple[List[str], List[str]]
     Returns:
         Tuple of (valid_databases, invalid_items)
     """
-    expanded_databases = expand_database_list(databases)
+    # Fast path: 'all' anywhere selects every database, all of them valid
+    if 'all' in databases:
+        return DATABASE_TOOLS.copy(), []
+    
+    valid_databases = []
+    invalid_items = []
+    
+    for db in databases:
+        if db in DATABASE_TOOLS_SET:
+            valid_databases.append(db)
+        else:
+            invalid_items.append(db)
+    
+    return valid_databases, invalid_items
+
+
+def _iter_tokens(text: str) -> Iterator[str]:
+    """Yield the non-empty, whitespace-stripped items of a comma-separated string"""
+    for token in text.split(','):
+        token = token.strip()
+        if token:
+            yield token
+
+
+def parse_and_validate_tools(tools_str: str) -> Tuple[List[str], List[str]]:
+    """
+    Parse a comma-separated tool string and validate it in a single pass
     
+    Equivalent to validate_tools_list() on the parsed items: groups and 'all'
+    are expanded and duplicates removed, keeping first-seen order.
+    
+    Args:
+        tools_str: Comma-separated tool names, group names, or 'all'
+        
+    Returns:
+        Tuple of (valid_tools, invalid_items)
+    """
+    valid_tools = []
+    invalid_items = []
+    
+    for tool in _expand_tool_groups(tuple(_iter_tokens(tools_str or ''))):
+        if tool in ALL_TOOLS_SET:
+            valid_tools.append(tool)
+        else:
+            invalid_items.append(tool)
+    
+    return valid_tools, invalid_items
+
+
+def parse_and_validate_databases(databases_str: str) -> Tuple[List[str], List[str]]:
+    """
+    Parse a comma-separated database string and validate it in a single pass
+    
+    Equivalent to validate_databases_list() on the parsed items: 'all'
+    anywhere selects every database.
+    
+    Args:
+        databases_str: Comma-separated database names or 'all'
+        
+    Returns:
+        Tuple of (valid_databases, invalid_items)
+    """
     valid_databases = []
     invalid_items = []
     
-    for db in expanded_databases:
-        if is_valid_database(db):
+    for db in _iter_tokens(databases_str or ''):
+        if db == 'all':
+            return DATABASE_TOOLS.copy(), []
+        if db in DATABASE_TOOLS_SET:
             valid_databases.append(db)
         else:
             invalid_items.append(db)
@@ -239,6 +312,7 @@ def validate_databases_list(databases: List[str]) -> tuple[List[str], List[str]]
     return valid_databases, invalid_items
 
 
+@functools.lru_cache(maxsize=None)
 def get_available_tools_summary() -> str:
     """
     Get a formatted summary of available tools and groups for help messages
@@ -252,7 +326,7 @@ def get_available_tools_summary() -> str:
     lines.append("=" * 50)
     for tool in sorted(ALL_TOOLS):
         desc = TOOL_DESCRIPTIONS.get(tool, '')
-        db_marker = ' (requires database)' if tool in DATABASE_TOOLS else ''
+        db_marker = ' (requires database)' if tool in DATABASE_TOOLS_SET else ''
         lines.append(f"  {tool:15} - {desc}{db_marker}")
     
     lines.append("\nTool groups:")
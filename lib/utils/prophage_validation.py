@@ -4,10 +4,66 @@ Prophage Validation Utilities
 Validation functions for the prophage workflow command.
 """
 
+import functools
+import itertools
+import os
+import stat
+import threading
 from pathlib import Path
 from typing import Tuple, List, Optional
 
 
+# FASTA file name extensions accepted as genome input
+GENOME_EXTENSIONS = ('.fa', '.fasta', '.fna')
+
+# Every upper/lower case spelling of the extensions, so a file suffix can be
+# matched case-insensitively without lowering it first
+_GENOME_SUFFIXES = frozenset(
+    ''.join(chars)
+    for ext in GENOME_EXTENSIONS
+    for chars in itertools.product(*({c, c.upper()} for c in ext))
+)
+
+# Valid GenoMAD presets, and their list for error messages
+_VALID_PRESETS = frozenset(('default', 'conservative', 'relaxed'))
+_PRESET_LIST_STR = 'default, conservative, relaxed'
+
+# Prophage databases by install name: (display name, directory name)
+_PROPHAGE_DATABASES = {
+    'genomad': ('GenoMAD', 'genomad_database'),
+    'vibrant': ('VIBRANT', 'vibrant_database')
+}
+
+# Location of the dereplicated genomes inside bacterial workflow results
+_BACTERIAL_SUBPATH = ('1.Genome_preprocessing', 'Bact3_dRep', 'drep_output', 'dereplicated_genomes')
+
+# Set PHORAGER_SKIP_VALIDATION=1 to trust the inputs (e.g. when re-running an
+# already validated workflow): the validators then accept their arguments
+# without checking them
+_VALIDATION_ENABLED = os.environ.get('PHORAGER_SKIP_VALIDATION', '0') != '1'
+
+# Result returned by the (is_valid, error_message) validators on success
+_OK = (True, None)
+
+# validate_databases arguments already checked by validate_all; their results
+# are in validate_databases' cache, so no background check is started for them
+_CHECKED_DATABASES = set()
+
+
+def _has_genome_files(directory: str) -> bool:
+    """
+    Check whether a directory holds any genome FASTA file, in one scan
+    
+    An unreadable directory counts as holding none, as it did with glob.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return any(entry.name.endswith(GENOME_EXTENSIONS) for entry in entries)
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=128)
 def validate_and_detect_genome_input(genome_path: str) -> Tuple[bool, Optional[str], Optional[Path], Optional[str]]:
     """
     Validate and detect the type of genome input
@@ -16,44 +72,54 @@ def validate_and_detect_genome_input(genome_path: str) -> Tuple[bool, Optional[s
         Tuple of (is_valid, input_mode, validated_path, error_message)
         input_mode: 'file' | 'directory' | 'bacterial_workflow' | None
     """
-    path = Path(genome_path)
+    if not _VALIDATION_ENABLED:
+        # The input mode is still needed, but the input is not checked
+        if os.path.isdir(os.path.join(genome_path, *_BACTERIAL_SUBPATH)):
+            input_mode = 'bacterial_workflow'
+        elif os.path.isdir(genome_path):
+            input_mode = 'directory'
+        else:
+            input_mode = 'file'
+        return (True, input_mode, Path(genome_path), None)
     
-    if not path.exists():
+    # One stat answers the existence, file and directory checks; a Path is
+    # only built for the validated result
+    try:
+        mode = os.stat(genome_path).st_mode
+    except (OSError, ValueError):
         return (False, None, None, f"Path does not exist: {genome_path}")
     
     # Check if it's a file
-    if path.is_file():
-        if path.suffix.lower() in ['.fa', '.fasta', '.fna']:
-            return (True, 'file', path, None)
+    if stat.S_ISREG(mode):
+        suffix = os.path.splitext(genome_path)[1]
+        if suffix in _GENOME_SUFFIXES:
+            return (True, 'file', Path(genome_path), None)
         else:
             return (False, None, None, 
-                   f"Invalid file extension: {path.suffix}. Must be .fa, .fasta, or .fna")
+                   f"Invalid file extension: {suffix}. Must be .fa, .fasta, or .fna")
     
     # Check if it's a directory
-    if path.is_dir():
+    if stat.S_ISDIR(mode):
         # First check for bacterial workflow structure
-        bacterial_genomes = path / "1.Genome_preprocessing" / "Bact3_dRep" / "drep_output" / "dereplicated_genomes"
+        bacterial_genomes = os.path.join(genome_path, *_BACTERIAL_SUBPATH)
         
-        if bacterial_genomes.exists() and bacterial_genomes.is_dir():
+        try:
+            is_bacterial_workflow = stat.S_ISDIR(os.stat(bacterial_genomes).st_mode)
+        except OSError:
+            is_bacterial_workflow = False
+        
+        if is_bacterial_workflow:
             # Validate it has genome files
-            genome_files = (list(bacterial_genomes.glob("*.fa")) + 
-                          list(bacterial_genomes.glob("*.fasta")) + 
-                          list(bacterial_genomes.glob("*.fna")))
-            
-            if genome_files:
-                return (True, 'bacterial_workflow', path, None)
+            if _has_genome_files(bacterial_genomes):
+                return (True, 'bacterial_workflow', Path(genome_path), None)
             else:
                 return (False, None, None, 
                        f"Bacterial workflow directory structure found but no genome files in:\n"
                        f"  {bacterial_genomes}")
         
         # Not bacterial structure, check for genome files directly in directory
-        genome_files = (list(path.glob("*.fa")) + 
-                       list(path.glob("*.fasta")) + 
-                       list(path.glob("*.fna")))
-        
-        if genome_files:
-            return (True, 'directory', path, None)
+        if _has_genome_files(genome_path):
+            return (True, 'directory', Path(genome_path), None)
         else:
             return (False, None, None, 
                    f"Directory contains no .fa, .fasta, or .fna files: {genome_path}")
@@ -61,30 +127,49 @@ def validate_and_detect_genome_input(genome_path: str) -> Tuple[bool, Optional[s
     return (False, None, None, f"Path is neither a file nor a directory: {genome_path}")
 
 
-def validate_tool_selection(skip_genomad: bool, skip_vibrant: bool, 
-                           genomad_preset: Optional[str], 
-                           vibrant_min_length: Optional[int]) -> Tuple[bool, Optional[str]]:
-    """
-    Validate tool selection and parameter conflicts
-    
-    Returns:
-        Tuple of (is_valid, error_message)
-    """
+def _check_tool_selection(skip_genomad: bool, skip_vibrant: bool,
+                          preset_set: bool, min_length_set: bool) -> Tuple[bool, Optional[str]]:
+    """Rules behind validate_tool_selection, evaluated once per combination"""
     # Check both tools aren't skipped
     if skip_genomad and skip_vibrant:
         return (False, "Cannot skip all tools. At least one prophage detection tool must run.")
     
     # Check for conflicting parameters - GenoMAD
-    if skip_genomad and genomad_preset is not None:
+    if skip_genomad and preset_set:
         return (False, "Cannot set --genomad-preset when --skip-genomad is enabled")
     
     # Check for conflicting parameters - VIBRANT
-    if skip_vibrant and vibrant_min_length is not None:
+    if skip_vibrant and min_length_set:
         return (False, "Cannot set --vibrant-min-length when --skip-vibrant is enabled")
     
-    return (True, None)
+    return _OK
+
+
+# Result of every combination of (skip_genomad, skip_vibrant, preset given,
+# min length given)
+_TOOL_SELECTION_TABLE = {
+    key: _check_tool_selection(*key)
+    for key in itertools.product((False, True), repeat=4)
+}
+
+
+def validate_tool_selection(skip_genomad: bool, skip_vibrant: bool, 
+                           genomad_preset: Optional[str], 
+                           vibrant_min_length: Optional[int]) -> Tuple[bool, Optional[str]]:
+    """
+    Validate tool selection and parameter conflicts
+    
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if not _VALIDATION_ENABLED:
+        return _OK
+    
+    return _TOOL_SELECTION_TABLE[(bool(skip_genomad), bool(skip_vibrant),
+                                  genomad_preset is not None, vibrant_min_length is not None)]
 
 
+@functools.lru_cache(maxsize=128)
 def validate_genomad_preset(preset: str) -> Tuple[bool, Optional[str]]:
     """
     Validate GenoMAD preset value
@@ -92,14 +177,16 @@ def validate_genomad_preset(preset: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    valid_presets = ['default', 'conservative', 'relaxed']
+    if not _VALIDATION_ENABLED:
+        return _OK
     
-    if preset not in valid_presets:
-        return (False, f"Invalid GenoMAD preset: '{preset}'. Must be one of: {', '.join(valid_presets)}")
+    if preset not in _VALID_PRESETS:
+        return (False, f"Invalid GenoMAD preset: '{preset}'. Must be one of: {_PRESET_LIST_STR}")
     
-    return (True, None)
+    return _OK
 
 
+@functools.lru_cache(maxsize=128)
 def validate_vibrant_min_length(min_length: int) -> Tuple[bool, Optional[str]]:
     """
     Validate VIBRANT minimum scaffold length
@@ -107,15 +194,19 @@ def validate_vibrant_min_length(min_length: int) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    if min_length < 500:
-        return (False, f"VIBRANT min length too small: {min_length} bp. Must be at least 500 bp")
+    if not _VALIDATION_ENABLED:
+        return _OK
     
-    if min_length > 50000:
+    # One comparison on the common in-range path
+    if not 500 <= min_length <= 50000:
+        if min_length < 500:
+            return (False, f"VIBRANT min length too small: {min_length} bp. Must be at least 500 bp")
         return (False, f"VIBRANT min length too large: {min_length} bp. Must be at most 50000 bp")
     
-    return (True, None)
+    return _OK
 
 
+@functools.lru_cache(maxsize=128)
 def validate_databases(db_location: str, skip_genomad: bool, skip_vibrant: bool) -> Tuple[bool, Optional[str]]:
     """
     Check that required databases exist
@@ -123,28 +214,135 @@ def validate_databases(db_location: str, skip_genomad: bool, skip_vibrant: bool)
     Returns:
         Tuple of (is_valid, error_message)
     """
-    db_path = Path(db_location)
+    if not _VALIDATION_ENABLED:
+        return _OK
+    
+    # Only the names of missing databases are collected; the message is
+    # built on the failure path
     missing_dbs = []
     
-    # Check GenoMAD database if tool will run
-    if not skip_genomad:
-        genomad_db = db_path / "genomad_database"
-        if not genomad_db.exists():
-            missing_dbs.append(("GenoMAD", "genomad", str(genomad_db)))
-    
-    # Check VIBRANT database if tool will run
-    if not skip_vibrant:
-        vibrant_db = db_path / "vibrant_database"
-        if not vibrant_db.exists():
-            missing_dbs.append(("VIBRANT", "vibrant", str(vibrant_db)))
-    
-    if missing_dbs:
-        error_msg = "Missing required databases:\n"
-        for tool_name, db_name, db_path in missing_dbs:
-            error_msg += f"  - {tool_name}: {db_path} not found\n"
-        error_msg += "\nInstall missing databases with:\n"
-        db_names = ','.join([db[1] for db in missing_dbs])
-        error_msg += f"  phorager install --databases {db_names}"
-        return (False, error_msg)
-    
-    return (True, None)
\ No newline at end of file
+    # Check the database of each tool that will run
+    for db_name, skipped in (('genomad', skip_genomad), ('vibrant', skip_vibrant)):
+        if not skipped and not os.path.isdir(os.path.join(db_location, _PROPHAGE_DATABASES[db_name][1])):
+            missing_dbs.append(db_name)
+    
+    if not missing_dbs:
+        return _OK
+    
+    lines = ["Missing required databases:"]
+    for db_name in missing_dbs:
+        tool_name, db_dir = _PROPHAGE_DATABASES[db_name]
+        lines.append(f"  - {tool_name}: {os.path.join(db_location, db_dir)} not found")
+    lines.append("")
+    lines.append("Install missing databases with:")
+    lines.append(f"  phorager install --databases {','.join(missing_dbs)}")
+    return (False, '\n'.join(lines))
+
+
+def validate_all(genome_path: str, db_location: str, skip_genomad: bool, skip_vibrant: bool,
+                 genomad_preset: Optional[str], vibrant_min_length: Optional[int],
+                 threads: Optional[int] = None,
+                 outdir: Optional[str] = None) -> Tuple[bool, Optional[str], Optional[Path], Optional[str]]:
+    """
+    Run every prophage input check in one pass, stopping at the first error
+    
+    The checks run in the order the prophage command reports them: genome
+    input, tool selection, GenoMAD preset, VIBRANT min length, threads,
+    output directory and databases. Each path is inspected once; the genome
+    and database checks reuse the cached results of their validators, and
+    the databases are checked concurrently with the genome input.
+    
+    Args:
+        genome_path: Genome file, directory or bacterial workflow results
+        db_location: Directory holding the installed databases
+        skip_genomad: Whether GenoMAD is skipped
+        skip_vibrant: Whether VIBRANT is skipped
+        genomad_preset: GenoMAD preset, or None if not given
+        vibrant_min_length: VIBRANT minimum scaffold length, or None if not given
+        threads: Number of threads, or None if not given
+        outdir: Output directory, created if missing, or None to skip the check
+    
+    Returns:
+        Tuple of (is_valid, input_mode, validated_path, error_message)
+        input_mode is set as soon as the genome input has been detected
+    """
+    # Check the databases on a background thread while the genome input is
+    # scanned, overlapping their stat latency on network filesystems. The
+    # thread only fills validate_databases' cache; its result is read last,
+    # so errors are still reported in order. Databases checked before are
+    # answered from that cache, without a thread
+    db_args = (db_location, skip_genomad, skip_vibrant)
+    db_check = None
+    if db_args not in _CHECKED_DATABASES:
+        _CHECKED_DATABASES.add(db_args)
+        db_check = threading.Thread(target=validate_databases, args=db_args, daemon=True)
+        db_check.start()
+    
+    # Validate genome input and detect type
+    is_valid, input_mode, validated_path, error = validate_and_detect_genome_input(genome_path)
+    if not is_valid:
+        return (False, None, None, error)
+    
+    # Parameter checks, only for the parameters that were given
+    is_valid, error = validate_tool_selection(skip_genomad, skip_vibrant,
+                                              genomad_preset, vibrant_min_length)
+    if is_valid and genomad_preset is not None:
+        is_valid, error = validate_genomad_preset(genomad_preset)
+    if is_valid and vibrant_min_length is not None:
+        is_valid, error = validate_vibrant_min_length(vibrant_min_length)
+    if not is_valid:
+        return (False, input_mode, None, error)
+    
+    # Shared with the bacterial workflow, which reports errors as ValueError
+    if threads is not None or outdir is not None:
+        from utils.bacterial_validation import validate_threads, validate_output_directory
+        try:
+            if threads is not None:
+                validate_threads(threads)
+            if outdir is not None:
+                validate_output_directory(outdir)
+        except ValueError as e:
+            return (False, input_mode, None, str(e))
+    
+    # Validate database availability
+    if db_check is not None:
+        db_check.join()
+    is_valid, error = validate_databases(*db_args)
+    if not is_valid:
+        return (False, input_mode, None, error)
+    
+    return (True, input_mode, validated_path, None)
+
+
+def clear_validation_cache() -> None:
+    """
+    Forget cached results of the validators that inspect the filesystem
+    
+    validate_and_detect_genome_input and validate_databases remember their
+    answer per argument; call this if the inputs or databases may have
+    changed since they were last validated in this process.
+    """
+    validate_and_detect_genome_input.cache_clear()
+    validate_databases.cache_clear()
+    _CHECKED_DATABASES.clear()
+
+
+def enable_validation() -> None:
+    """Turn input validation back on after disable_validation()"""
+    global _VALIDATION_ENABLED
+    _VALIDATION_ENABLED = True
+    _clear_all_caches()
+
+
+def disable_validation() -> None:
+    """Accept all inputs without checking them (see PHORAGER_SKIP_VALIDATION)"""
+    global _VALIDATION_ENABLED
+    _VALIDATION_ENABLED = False
+    _clear_all_caches()
+
+
+def _clear_all_caches() -> None:
+    """Drop every memoized result, which depends on the validation mode"""
+    clear_validation_cache()
+    validate_genomad_preset.cache_clear()
+    validate_vibrant_min_length.cache_clear()
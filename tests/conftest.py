@@ -0,0 +1,291 @@
+"""
+Shared pytest fixtures for the Phorager wrapper tests
+
+Provides the phorager executable, a command runner, test input files and
+a temporary HOME with a configuration pointing at mock databases.
+
+Every test uses its own tmp_path as HOME, so tests share no config and
+can run in parallel. The complete mock database tree is only read, so it
+is created once per session and shared. Commands run in-process through
+the phorager script's main(), loaded once per session, so the interpreter
+and CLI imports are paid once rather than per command; run_process starts
+the real executable for the tests that check it end to end.
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import pytest
+
+# Command modules imported by the in-process fixtures
+LIB_DIR = Path(__file__).resolve().parent.parent / 'lib'
+
+# Seconds a phorager command may take; help, validation and dry runs finish
+# well within a second, so anything slower has hung
+COMMAND_TIMEOUT = 10
+
+# Test config, serialised once; only the database location varies per test
+_DB_LOCATION_PLACEHOLDER = '"@DB_LOCATION@"'
+_CONFIG_TEMPLATE = json.dumps({
+    "backend": "conda",
+    "db_location": _DB_LOCATION_PLACEHOLDER.strip('"'),
+    "cache_location": "/tmp/test_cache"
+})
+
+
+# Contents of the test prophage FASTA files
+_PROPHAGE_FASTA = (
+    ">prophage_1\nATCGATCGATCGATCGATCGATCGATCGATCGATCG\n"
+    ">prophage_2\nGCTAGCTAGCTAGCTAGCTAGCTAGCTAGCTAGCTA\n"
+    ">prophage_3\nTATATATATATATATATATATATATATATATATATA\n"
+)
+
+
+def _write_test_config(home: Path, db_location: Optional[str] = None) -> str:
+    """
+    Write the test config into home/.phorager, replacing any existing one
+    
+    Args:
+        home: Directory used as HOME
+        db_location: Database location; defaults to home/databases (not created)
+    
+    Returns:
+        Database location set in the config
+    """
+    config_dir = home / ".phorager"
+    config_dir.mkdir(exist_ok=True)
+    
+    # json.dumps escapes the path like the rest of the template
+    if db_location is None:
+        db_location = str(home / "databases")
+    (config_dir / "config.json").write_text(
+        _CONFIG_TEMPLATE.replace(_DB_LOCATION_PLACEHOLDER, json.dumps(db_location))
+    )
+    return db_location
+
+
+def _create_databases(db_location: str, skip_annotation: bool = False):
+    """Create the mock databases (empty directories), only CheckV's if skipping annotation"""
+    db_names = ("checkv",) if skip_annotation else ("checkv", "pharokka", "phold")
+    for db_name in db_names:
+        Path(db_location, f"{db_name}_database").mkdir(parents=True, exist_ok=True)
+
+
+def _run_phorager(phorager_path: str, args: List[str], home: Path,
+                  timeout: float = COMMAND_TIMEOUT) -> Tuple[int, str, str]:
+    """Run a phorager command with the given HOME and return exit code, stdout, stderr"""
+    cmd = [phorager_path] + args
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env=dict(os.environ, HOME=str(home))
+        )
+    except subprocess.TimeoutExpired:
+        pytest.fail(f"Command hung for {timeout}s: {' '.join(cmd)}")
+    return result.returncode, result.stdout, result.stderr
+
+
+@pytest.fixture(scope="session")
+def phorager_path() -> str:
+    """
+    Find the phorager executable, once per test session
+    
+    The checkout the tests belong to is tried first, so the tests do not
+    depend on the working directory. Tests that run the executable are
+    skipped if it cannot be found; in-process tests still run.
+    """
+    possible_paths = [
+        LIB_DIR.parent / 'phorager',
+        './phorager',
+        '../phorager',
+        'phorager'
+    ]
+    
+    for path in possible_paths:
+        if os.path.exists(path):
+            return os.path.abspath(path)
+    
+    pytest.skip("Could not find phorager executable")
+
+
+@pytest.fixture
+def run_process(phorager_path, tmp_path) -> Callable[..., Tuple[int, str, str]]:
+    """Run the phorager executable, with the test directory as HOME, and return exit code, stdout, stderr"""
+    def run(args: List[str], timeout: float = COMMAND_TIMEOUT) -> Tuple[int, str, str]:
+        return _run_phorager(phorager_path, args, tmp_path, timeout)
+    
+    return run
+
+
+@pytest.fixture(scope="session")
+def phorager_cli(phorager_path):
+    """
+    The phorager script loaded as a module, once per session
+    
+    Loading it imports the CLI and every command module, which is most of
+    the cost of starting phorager.
+    """
+    loader = importlib.machinery.SourceFileLoader('phorager_cli', phorager_path)
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def run_command(phorager_cli, tmp_path, monkeypatch, capfd) -> Callable[[List[str]], Tuple[int, str, str]]:
+    """
+    Run a phorager command in-process, with the test directory as HOME
+    
+    The config location and home directory are resolved when the command
+    modules are imported, so they are pointed at the test directory here.
+    Errors are written straight to file descriptor 2, hence capfd.
+    
+    Returns:
+        Function returning exit code, stdout, stderr like run_process
+    """
+    import commands.annotation
+    monkeypatch.setattr(commands.annotation, 'CONFIG_FILE', tmp_path / '.phorager' / 'config.json')
+    monkeypatch.setattr(commands.annotation, '_HOME', tmp_path)
+    
+    def run(args: List[str]) -> Tuple[int, str, str]:
+        monkeypatch.setattr(sys, 'argv', ['phorager'] + args)
+        try:
+            phorager_cli.main()
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = 0 if e.code is None else e.code
+        stdout, stderr = capfd.readouterr()
+        return exit_code, stdout, stderr
+    
+    return run
+
+
+@pytest.fixture(scope="session")
+def annotation_parser() -> argparse.ArgumentParser:
+    """Parser of the annotation subcommand, built in-process"""
+    if str(LIB_DIR) not in sys.path:
+        sys.path.insert(0, str(LIB_DIR))
+    from commands.annotation import AnnotationCommand
+    
+    parser = argparse.ArgumentParser(prog='phorager annotation')
+    AnnotationCommand.add_arguments(parser)
+    return parser
+
+
+@pytest.fixture
+def run_validate(annotation_parser, capfd) -> Callable[[List[str]], Tuple[int, str, str]]:
+    """
+    Run `phorager annotation --validate-only` in-process with the given arguments
+    
+    The command stops after checking the input and parameters, so cases
+    exercising argument validation need no config, databases or subprocess.
+    Errors are written straight to file descriptor 2, hence capfd.
+    
+    Returns:
+        Function returning exit code, stdout, stderr like run_command
+    """
+    from commands.annotation import AnnotationCommand
+    
+    def run(args: List[str]) -> Tuple[int, str, str]:
+        try:
+            parsed_args = annotation_parser.parse_args(['--validate-only'] + args)
+        except SystemExit as e:
+            exit_code = e.code
+        else:
+            exit_code = 0 if AnnotationCommand().run(parsed_args) is True else 1
+        stdout, stderr = capfd.readouterr()
+        return exit_code, stdout, stderr
+    
+    return run
+
+
+@pytest.fixture(scope="session")
+def make_prophage_file() -> Callable[..., str]:
+    """Write a small three-record prophage FASTA file"""
+    def make(path, name: str = "prophages.fasta") -> str:
+        prophage_path = os.path.join(path, name)
+        Path(prophage_path).write_text(_PROPHAGE_FASTA)
+        return prophage_path
+    
+    return make
+
+
+@pytest.fixture(scope="session")
+def shared_prophage_fasta(tmp_path_factory, make_prophage_file) -> str:
+    """
+    Prophage FASTA written once per session
+    
+    For tests that only read their input; tests needing a file they can
+    modify, or a particular name or layout, use make_prophage_file.
+    """
+    return make_prophage_file(tmp_path_factory.mktemp("shared"))
+
+
+@pytest.fixture
+def phorager_home(tmp_path):
+    """
+    Write the test config into the test directory used as HOME
+    
+    The config points at a databases directory inside the test directory,
+    so each test has its own (initially empty) database location.
+    """
+    _write_test_config(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def mock_db_tree(tmp_path_factory) -> str:
+    """
+    All mock databases (empty directories), created once per session
+    
+    Shared by every test needing the complete set; tests must not modify it.
+    """
+    db_location = str(tmp_path_factory.mktemp("databases"))
+    _create_databases(db_location)
+    return db_location
+
+
+@pytest.fixture
+def setup_databases(phorager_home, mock_db_tree) -> Callable[..., str]:
+    """
+    Provide the mock databases used by the annotation workflow
+    
+    Returns:
+        Function returning the database location. By default the test config
+        is pointed at the shared mock_db_tree; with skip_annotation=True only
+        the CheckV database is created, in the test's own database location.
+    """
+    def setup(skip_annotation: bool = False) -> str:
+        if not skip_annotation:
+            return _write_test_config(phorager_home, mock_db_tree)
+        
+        db_location = os.path.join(phorager_home, "databases")
+        _create_databases(db_location, skip_annotation)
+        return db_location
+    
+    return setup
+
+
+@pytest.fixture(scope="session")
+def baseline_dry_run(phorager_path, shared_prophage_fasta, mock_db_tree,
+                     tmp_path_factory) -> Tuple[int, str, str]:
+    """
+    Result of the default `phorager annotation --prophage <shared FASTA> --dry-run`
+    
+    Run once per session, with the test config and all databases in place,
+    for the tests that only inspect this default invocation.
+    """
+    home = tmp_path_factory.mktemp("baseline_home")
+    _write_test_config(home, mock_db_tree)
+    return _run_phorager(phorager_path, ['annotation', '--prophage', shared_prophage_fasta, '--dry-run'], home)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test script for the exports of the Phorager utils package.
+
+Checks that every name listed in utils.__all__ resolves through the lazy
+loader, that star-imports work, and that unknown names raise AttributeError.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+LIB_DIR = Path(__file__).resolve().parent.parent / 'lib'
+
+
+class UtilsExportsTester:
+    """Test runner for utils package exports"""
+    
+    def __init__(self):
+        self.test_results = []
+    
+    def _record_test(self, test_name: str, passed: bool, message: str = ""):
+        """Record test result"""
+        status = "PASS" if passed else "FAIL"
+        self.test_results.append((test_name, passed, message))
+        print(f"[{status}] {test_name}")
+        if message and not passed:
+            print(f"      {message}")
+    
+    def _run_python(self, code: str) -> subprocess.CompletedProcess:
+        """Run a snippet in a fresh interpreter with lib/ on the path"""
+        return subprocess.run(
+            [sys.executable, '-c', f"import sys; sys.path.insert(0, {str(LIB_DIR)!r})\n{code}"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    
+    def test_all_names_resolve(self):
+        """Every name in __all__ should resolve to an attribute"""
+        print("\n=== Testing __all__ Resolution ===")
+        
+        result = self._run_python(
+            "import utils\n"
+            "missing = [n for n in utils.__all__ if not hasattr(utils, n)]\n"
+            "print(len(utils.__all__), missing)"
+        )
+        self._record_test(
+            "All __all__ names resolve",
+            result.returncode == 0 and result.stdout.strip().endswith("[]"),
+            f"stdout: {result.stdout.strip()} stderr: {result.stderr.strip()}"
+        )
+    
+    def test_no_fused_names(self):
+        """Entries of __all__ should be distinct, separately listed names"""
+        print("\n=== Testing __all__ Entries ===")
+        
+        result = self._run_python(
+            "import utils\n"
+            "print(len(utils.__all__) == len(set(utils.__all__)), "
+            "[n for n in utils.__all__ if n.count('validate_') > 1])"
+        )
+        self._record_test(
+            "No duplicate or concatenated names in __all__",
+            result.returncode == 0 and result.stdout.strip() == "True []",
+            f"stdout: {result.stdout.strip()} stderr: {result.stderr.strip()}"
+        )
+    
+    def test_star_import(self):
+        """`from utils import *` should succeed and bind every exported name"""
+        print("\n=== Testing Star Import ===")
+        
+        result = self._run_python(
+            "from utils import *\n"
+            "import utils\n"
+            "print(all(name in globals() for name in utils.__all__))"
+        )
+        self._record_test(
+            "Star import binds all exported names",
+            result.returncode == 0 and result.stdout.strip() == "True",
+            f"stdout: {result.stdout.strip()} stderr: {result.stderr.strip()}"
+        )
+    
+    def test_annotation_alias(self):
+        """validate_annotation_databases should be the annotation validator"""
+        print("\n=== Testing Aliased Export ===")
+        
+        result = self._run_python(
+            "import utils\n"
+            "from utils.annotation_validation import validate_databases\n"
+            "print(utils.validate_annotation_databases is validate_databases)"
+        )
+        self._record_test(
+            "validate_annotation_databases aliases annotation validate_databases",
+            result.returncode == 0 and result.stdout.strip() == "True",
+            f"stdout: {result.stdout.strip()} stderr: {result.stderr.strip()}"
+        )
+    
+    def test_unknown_name(self):
+        """Unknown attributes should raise AttributeError"""
+        print("\n=== Testing Unknown Names ===")
+        
+        result = self._run_python(
+            "import utils\n"
+            "try:\n"
+            "    utils.does_not_exist\n"
+            "except AttributeError:\n"
+            "    print('AttributeError')"
+        )
+        self._record_test(
+            "Unknown name raises AttributeError",
+            result.returncode == 0 and result.stdout.strip() == "AttributeError",
+            f"stdout: {result.stdout.strip()} stderr: {result.stderr.strip()}"
+        )
+    
+    def test_lazy_loading(self):
+        """Importing the package should not import any validation module"""
+        print("\n=== Testing Lazy Loading ===")
+        
+        result = self._run_python(
+            "import utils\n"
+            "print(sorted(m for m in sys.modules if m.startswith('utils.')))"
+        )
+        self._record_test(
+            "Package import loads no validation modules",
+            result.returncode == 0 and result.stdout.strip() == "[]",
+            f"stdout: {result.stdout.strip()} stderr: {result.stderr.strip()}"
+        )
+    
+    def run_all_tests(self):
+        """Run all test suites"""
+        print("Starting Phorager Utils Exports Test Suite")
+        print("=" * 60)
+        
+        try:
+            self.test_all_names_resolve()
+            self.test_no_fused_names()
+            self.test_star_import()
+            self.test_annotation_alias()
+            self.test_unknown_name()
+            self.test_lazy_loading()
+            
+        except Exception as e:
+            print(f"Test suite failed with exception: {e}")
+            return False
+        
+        # Print summary
+        self.print_summary()
+        
+        # Return overall success
+        failed_tests = [result for result in self.test_results if not result[1]]
+        return len(failed_tests) == 0
+    
+    def print_summary(self):
+        """Print test results summary"""
+        print("\n" + "=" * 60)
+        print("TEST SUMMARY")
+        print("=" * 60)
+        
+        total_tests = len(self.test_results)
+        passed_tests = len([result for result in self.test_results if result[1]])
+        failed_tests = total_tests - passed_tests
+        
+        print(f"Total tests: {total_tests}")
+        print(f"Passed: {passed_tests}")
+        print(f"Failed: {failed_tests}")
+        
+        if failed_tests > 0:
+            print("\nFailed tests:")
+            for test_name, passed, message in self.test_results:
+                if not passed:
+                    print(f"  - {test_name}")
+                    if message:
+                        print(f"    {message}")
+        
+        print("=" * 60)
+
+
+def main():
+    """Main test runner"""
+    tester = UtilsExportsTester()
+    success = tester.run_all_tests()
+    
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())